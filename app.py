@@ -4,17 +4,37 @@ Main application file
 """
 
 import streamlit as st
+import atexit
+import gc
+import io
 import os
+import pickle
 import time
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterator
 import tempfile
+from pydub import AudioSegment
 
 # Import our custom modules
-from audio_processor import AudioProcessor
+from audio_processor import AudioProcessor, OPUS_BITRATE_KBPS, MP3_BITRATE_KBPS
 from whisper_client import WhisperClient
 from transcription_utils import TranscriptionProcessor, TranscriptionExporter
+from config import Config
 
 
+# Language choices shown in the sidebar, built once rather than on every rerun
+LANGUAGES = tuple(Config.LANGUAGE_OPTIONS)
+
+# How often a running background transcription is polled for progress
+JOB_POLL_INTERVAL_SECONDS = 0.5
+
+# Lets a part of the page rerun on its own when only its widgets change
+# (st.experimental_fragment from Streamlit 1.33; older versions rerun the whole script)
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', lambda func: func)
+
+# Characters of transcript shown per page in the results view
+TRANSCRIPT_PAGE_CHARS = 5000
+
 # Page configuration
 st.set_page_config(
     page_title="Audio Transcription App",
@@ -24,7 +44,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -67,21 +87,47 @@ st.markdown("""
         margin: 0 0.5rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+HEADER_HTML = """
+<h1 class="main-header">🎤 Audio Transcription App</h1>
+<div class="info-box">
+    <strong>Powered by OpenAI Whisper</strong><br>
+    Upload audio files of any size and get accurate transcriptions with timestamps. 
+    Large files are automatically split into chunks for optimal processing.
+</div>
+"""
+
+# Styling and header are static, so the markup sent on every rerun is built once
+HEADER_MARKUP = PAGE_CSS + HEADER_HTML
 
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'transcription_result' not in st.session_state:
-        st.session_state.transcription_result = None
+    if 'transcription_result_path' not in st.session_state:
+        st.session_state.transcription_result_path = None
     if 'processing_complete' not in st.session_state:
         st.session_state.processing_complete = False
     if 'temp_files' not in st.session_state:
         st.session_state.temp_files = []
+    if 'failed_chunks' not in st.session_state:
+        st.session_state.failed_chunks = 0
+    if 'transcription_job' not in st.session_state:
+        st.session_state.transcription_job = None
+    if 'job_summary' not in st.session_state:
+        st.session_state.job_summary = None
+    if 'gc_tuned' not in st.session_state:
+        # Collect generation 0 far less often so large AudioSegments don't
+        # trigger GC pauses mid-transcription; trades higher peak RSS for
+        # fewer pauses. Transcription jobs collect once when done.
+        gc.set_threshold(700 * 100, 10, 10)
+        st.session_state.gc_tuned = True
 
 
-def get_api_key() -> Optional[str]:
-    """Get OpenAI API key from secrets, environment, or session state"""
+@st.cache_data(ttl=300, show_spinner=False)
+def _configured_api_key() -> Optional[str]:
+    """Look up the deployment's API key in secrets or the environment"""
     # Try Streamlit secrets first
     try:
         api_key = st.secrets.get("OPENAI_API_KEY")
@@ -91,7 +137,12 @@ def get_api_key() -> Optional[str]:
         pass
     
     # Try environment variable
-    api_key = os.getenv("OPENAI_API_KEY")
+    return os.getenv("OPENAI_API_KEY") or None
+
+
+def get_api_key() -> Optional[str]:
+    """Get OpenAI API key from secrets, environment, or session state"""
+    api_key = _configured_api_key()
     if api_key:
         return api_key
     
@@ -102,16 +153,64 @@ def get_api_key() -> Optional[str]:
     return None
 
 
+def _remove_files(paths: set):
+    """Delete files, ignoring ones that are already gone"""
+    for path in list(paths):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        paths.discard(path)
+
+
+@st.cache_resource
+def _result_files() -> set:
+    """Paths of persisted transcription results, deleted at interpreter exit"""
+    paths = set()
+    atexit.register(_remove_files, paths)
+    return paths
+
+
+def save_transcription_result(result: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Persist a transcription result to disk, replacing this session's previous one
+    
+    Session state only keeps the returned path, so a finished transcription
+    does not pin its text, segments and words in RAM for the life of the session.
+    Returns None (after discarding the previous result) when result is None.
+    """
+    previous_path = st.session_state.transcription_result_path
+    if previous_path:
+        _remove_files({previous_path})
+        _result_files().discard(previous_path)
+    
+    if not result:
+        return None
+    
+    with tempfile.NamedTemporaryFile(delete=False, prefix='transcription_', suffix='.pkl') as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    _result_files().add(f.name)
+    return f.name
+
+
+def load_transcription_result(path: str) -> Optional[Dict[str, Any]]:
+    """Load a transcription result saved by save_transcription_result"""
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError):
+        return None
+
+
+def cleanup_session_temp_files(audio_processor: AudioProcessor):
+    """Delete temporary files tracked in session state"""
+    audio_processor.cleanup_temp_files(st.session_state.temp_files)
+    st.session_state.temp_files = []
+
+
 def display_header():
-    """Display application header"""
-    st.markdown('<h1 class="main-header">🎤 Audio Transcription App</h1>', unsafe_allow_html=True)
-    st.markdown("""
-    <div class="info-box">
-        <strong>Powered by OpenAI Whisper</strong><br>
-        Upload audio files of any size and get accurate transcriptions with timestamps. 
-        Large files are automatically split into chunks for optimal processing.
-    </div>
-    """, unsafe_allow_html=True)
+    """Display application header along with the page styling"""
+    st.markdown(HEADER_MARKUP, unsafe_allow_html=True)
 
 
 def display_sidebar():
@@ -147,26 +246,12 @@ def display_sidebar():
         # Language selection
         language = st.selectbox(
             "Language (optional)",
-            ["Auto-detect", "English", "Spanish", "French", "German", "Italian", 
-             "Portuguese", "Russian", "Japanese", "Korean", "Chinese"],
+            LANGUAGES,
             help="Leave as 'Auto-detect' for automatic language detection"
         )
         
         # Convert language selection to code
-        language_codes = {
-            "Auto-detect": None,
-            "English": "en",
-            "Spanish": "es", 
-            "French": "fr",
-            "German": "de",
-            "Italian": "it",
-            "Portuguese": "pt",
-            "Russian": "ru",
-            "Japanese": "ja",
-            "Korean": "ko",
-            "Chinese": "zh"
-        }
-        selected_language = language_codes[language]
+        selected_language = Config.LANGUAGE_OPTIONS[language]
         
         # Advanced settings
         with st.expander("Advanced Settings"):
@@ -183,7 +268,7 @@ def display_sidebar():
                 min_value=1,
                 max_value=5,
                 value=3,
-                help="Overlap between chunks to avoid word cutoffs"
+                help="Overlap added at chunk cuts that could not be placed in silence, to avoid word cutoffs"
             )
             
             show_timestamps = st.checkbox(
@@ -197,6 +282,38 @@ def display_sidebar():
                 value=False,
                 help="Skip silence detection and use time-based splitting (faster for large files)"
             )
+            
+            use_numpy_vad = st.checkbox(
+                "Fast silence detection",
+                value=True,
+                help="Detect silence with vectorized NumPy energy analysis instead of ffmpeg's silencedetect filter"
+            )
+            
+            use_opus = st.checkbox(
+                "Encode chunks as Opus",
+                value=True,
+                help="Upload chunks as 24kbps OGG/Opus instead of 64kbps MP3 (much smaller uploads)"
+            )
+            
+            include_word_timestamps = st.checkbox(
+                "Word-level timestamps",
+                value=False,
+                help="Request per-word timings for the JSON export (makes API responses several times larger)"
+            )
+            
+            text_only = st.checkbox(
+                "Text only (no timestamps)",
+                value=False,
+                help="Fastest option: request plain text without segment timings (disables SRT/VTT export)"
+            )
+            
+            max_concurrent_requests = st.slider(
+                "Parallel API requests",
+                min_value=1,
+                max_value=16,
+                value=Config.MAX_CONCURRENT_REQUESTS,
+                help="How many chunks are transcribed at once; lower this if you hit rate limits"
+            )
         
         # App information
         st.markdown("---")
@@ -217,7 +334,12 @@ def display_sidebar():
             'chunk_size': chunk_size,
             'overlap_seconds': overlap_seconds,
             'show_timestamps': show_timestamps,
-            'force_time_based': force_time_based
+            'force_time_based': force_time_based,
+            'use_numpy_vad': use_numpy_vad,
+            'use_opus': use_opus,
+            'include_word_timestamps': include_word_timestamps,
+            'text_only': text_only,
+            'max_concurrent_requests': max_concurrent_requests
         }
 
 
@@ -234,10 +356,8 @@ def display_file_upload():
     return uploaded_file
 
 
-def display_audio_info(audio_processor: AudioProcessor, audio_segment):
-    """Display audio file information"""
-    info = audio_processor.get_audio_info(audio_segment)
-    
+def display_audio_info(audio_processor: AudioProcessor, audio_segment, info: Dict[str, Any]):
+    """Display audio file information (info as returned by validate_audio_file)"""
     st.markdown("### 📋 File Information")
     
     col1, col2, col3, col4 = st.columns(4)
@@ -262,24 +382,37 @@ def display_audio_info(audio_processor: AudioProcessor, audio_segment):
         st.success("✅ File size is within limits - no chunking needed")
 
 
-def process_transcription(uploaded_file, settings: Dict[str, Any]):
-    """Process audio transcription with detailed debugging"""
-    import time
+def process_transcription(uploaded_file, settings: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Validate and chunk an upload, then start transcribing it in the background
+    
+    Returns the background job (see poll_transcription_job), or None if the
+    upload was rejected.
+    """
+    clock = time.perf_counter
+    timings = {}
     
     # Initialize components
     st.markdown("### 🔧 Initializing Components")
-    init_start = time.time()
+    init_start = phase_start = clock()
     
     audio_processor = AudioProcessor(
         max_chunk_size_mb=settings['chunk_size'],
         overlap_seconds=settings['overlap_seconds'],
-        force_time_based=settings['force_time_based']
+        force_time_based=settings['force_time_based'],
+        use_numpy_vad=settings['use_numpy_vad'],
+        upload_bitrate_kbps=OPUS_BITRATE_KBPS if settings['use_opus'] else MP3_BITRATE_KBPS
     )
     st.info(f"✅ Audio processor initialized (chunk size: {settings['chunk_size']}MB, overlap: {settings['overlap_seconds']}s)")
     
     whisper_client = WhisperClient(
         api_key=settings['api_key'],
-        model="whisper-1"
+        model="whisper-1",
+        use_opus=settings['use_opus'],
+        verbose=False,
+        max_concurrent_requests=settings['max_concurrent_requests'],
+        include_word_timestamps=settings['include_word_timestamps'],
+        text_only=settings['text_only']
     )
     st.info("✅ Whisper client initialized")
     
@@ -287,100 +420,237 @@ def process_transcription(uploaded_file, settings: Dict[str, Any]):
     exporter = TranscriptionExporter()
     st.info("✅ Transcription utilities initialized")
     
-    init_time = time.time() - init_start
-    st.success(f"🚀 All components ready in {init_time:.2f} seconds")
+    timings['Initialization'] = clock() - phase_start
+    st.success("🚀 All components ready")
     
     # Validate and process audio file
     st.markdown("### 🔍 Validating Audio File")
-    validation_start = time.time()
+    phase_start = clock()
     
     st.info(f"📁 Processing file: {uploaded_file.name} ({uploaded_file.size / (1024*1024):.1f} MB)")
     
-    is_valid, error_msg, audio_segment = audio_processor.validate_audio_file(uploaded_file)
+    # Reject bad uploads before copying or hashing them
+    is_valid, error_msg = audio_processor.validate_upload(uploaded_file)
+    if not is_valid:
+        st.error(f"❌ {error_msg}")
+        return None
+    
+    file_hash = audio_processor.compute_upload_hash(uploaded_file)
+    
+    # Small uploads are sent as they are; decoding them would only cost time,
+    # but their headers are still checked so unreadable files never reach the API
+    if audio_processor.fits_single_request(uploaded_file):
+        is_valid, error_msg, duration = audio_processor.probe_upload(uploaded_file)
+        timings['Validation'] = clock() - phase_start
+        if not is_valid:
+            st.error(f"❌ {error_msg}")
+            return None
+        
+        st.success("✅ File fits in a single request; skipping decoding and chunking")
+        results = _single_request_results(whisper_client, uploaded_file, file_hash, settings['language'],
+                                          duration)
+        return _start_transcription_job(results, 1, whisper_client, transcription_processor,
+                                        timings, init_start)
     
-    validation_time = time.time() - validation_start
-    st.info(f"⏱️ Validation took {validation_time:.2f} seconds")
+    # Remove files left behind by an interrupted run. Only formats that need
+    # ffmpeg are streamed to disk; the rest are decoded from the upload's buffer
+    cleanup_session_temp_files(audio_processor)
+    audio_source = uploaded_file
+    if audio_processor.needs_disk_copy(uploaded_file):
+        audio_source = audio_processor.save_uploaded_file(uploaded_file)
+        st.session_state.temp_files.append(audio_source)
+    
+    is_valid, error_msg, upload_audio, audio_info = audio_processor.validate_audio_file(audio_source, file_hash)
+    
+    timings['Validation'] = clock() - phase_start
     
     if not is_valid:
         st.error(f"❌ {error_msg}")
+        cleanup_session_temp_files(audio_processor)
         return None
     
     st.success("✅ Audio file validated successfully")
     
     # Display audio information
-    display_audio_info(audio_processor, audio_segment)
+    display_audio_info(audio_processor, upload_audio, audio_info)
     
     # Split audio into chunks
     st.markdown("### 🔄 Processing Audio")
-    chunking_start = time.time()
+    phase_start = clock()
     
     st.info("🔄 Starting intelligent audio chunking...")
-    chunks = audio_processor.split_audio_intelligently(audio_segment)
+    chunk_plan = audio_processor.plan_chunks_cached(upload_audio, file_hash)
+    total_chunks = len(chunk_plan)
     
-    chunking_time = time.time() - chunking_start
-    st.info(f"⏱️ Chunking took {chunking_time:.2f} seconds")
-    st.success(f"📦 Audio split into {len(chunks)} chunks")
+    timings['Chunking'] = clock() - phase_start
+    st.success(f"📦 Audio split into {total_chunks} chunks")
     
     # Show chunk details
     with st.expander("📊 Chunk Details", expanded=False):
-        for i, (chunk, metadata) in enumerate(chunks):
-            st.write(f"Chunk {i+1}: {metadata['duration']:.1f}s ({metadata.get('split_method', 'unknown')})")
-    
-    # Transcribe chunks
-    st.markdown("### 🎯 Transcribing Audio")
-    
-    # Create progress bar and status
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    time_text = st.empty()
-    
-    chunk_results = []
-    transcription_start = time.time()
-    
-    for i, chunk_data in enumerate(chunks):
-        chunk_start_time = time.time()
-        status_text.text(f"🔄 Processing chunk {i + 1} of {len(chunks)}")
-        
-        # Show chunk info
-        chunk, metadata = chunk_data
-        st.info(f"📦 Chunk {i+1}: {metadata['duration']:.1f}s, method: {metadata.get('split_method', 'unknown')}")
-        
-        # Transcribe chunk
-        result = whisper_client.transcribe_chunk(
-            chunk_data, i, len(chunks), 
-            language=settings['language']
-        )
-        
-        chunk_time = time.time() - chunk_start_time
-        time_text.text(f"⏱️ Chunk {i+1} completed in {chunk_time:.2f}s")
+        st.dataframe([
+            {
+                'Chunk': i + 1,
+                'Start (s)': round(metadata['start_time'], 1),
+                'Duration (s)': round(metadata['duration'], 1),
+                'Method': metadata.get('split_method', 'unknown')
+            }
+            for i, metadata in enumerate(chunk_plan)
+        ], use_container_width=True, hide_index=True)
+    
+    # Everything is decoded in memory now, so the spilled upload can go
+    cleanup_session_temp_files(audio_processor)
+    
+    # Chunks are sliced lazily and transcribed concurrently; results arrive in completion order
+    chunks = audio_processor.iter_chunks(upload_audio, chunk_plan)
+    results = whisper_client.transcribe_chunks_concurrent(chunks, language=settings['language'],
+                                                          total_chunks=total_chunks)
+    return _start_transcription_job(results, total_chunks, whisper_client, transcription_processor,
+                                    timings, init_start)
+
+
+def _single_request_results(whisper_client: WhisperClient, uploaded_file, file_hash: str,
+                            language: Optional[str], duration: float) -> Iterator[Dict[str, Any]]:
+    """Yield the result of sending a whole upload in one request, once iterated"""
+    yield whisper_client.transcribe_upload(uploaded_file, file_hash, language=language, duration=duration)
+
+
+def _start_transcription_job(results: Iterator[Dict[str, Any]], total_chunks: int,
+                             whisper_client: WhisperClient,
+                             transcription_processor: TranscriptionProcessor,
+                             timings: Dict[str, float], init_start: float) -> Dict[str, Any]:
+    """
+    Consume lazily produced chunk results on a background thread
+    
+    The upload runs there so this script run can finish and the page stays
+    responsive; main() polls the returned job and reruns until it is done.
+    """
+    job = {
+        'total_chunks': total_chunks,
+        'completed': 0,
+        'chunk_results': [None] * total_chunks,
+        'log_lines': [],
+        'max_concurrent_requests': min(whisper_client.max_concurrent_requests, total_chunks),
+        'timings': timings,
+        'init_start': init_start,
+        'total_time': None
+    }
+    job['future'] = _transcription_executor().submit(
+        _run_transcription_job, job, results, transcription_processor
+    )
+    return job
+
+
+@st.cache_resource
+def _transcription_executor() -> ThreadPoolExecutor:
+    """Worker threads for background transcription jobs, shared by all sessions"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix='transcription')
+
+
+def _run_transcription_job(job: Dict[str, Any], results: Iterator[Dict[str, Any]],
+                           transcription_processor: TranscriptionProcessor) -> Dict[str, Any]:
+    """
+    Transcribe and combine a job's chunks on a background thread
+    
+    Only updates the job dict; the script thread renders its progress in
+    display_transcription_progress.
+    """
+    clock = time.perf_counter
+    total_chunks = job['total_chunks']
+    phase_start = clock()
+    
+    for result in results:
+        i = result['chunk_index']
+        metadata = result['chunk_metadata']
         
-        # Show result
         if result['success']:
-            st.success(f"✅ Chunk {i+1} transcribed: {len(result['text'])} characters")
+            outcome = f"✅ {len(result['text'])} characters"
         else:
-            st.error(f"❌ Chunk {i+1} failed: {result.get('error', 'Unknown error')}")
+            outcome = f"❌ {result.get('error', 'Unknown error')}"
+        job['log_lines'].append(
+            f"Chunk {i+1}/{total_chunks}: {metadata['duration']:.1f}s "
+            f"({metadata.get('split_method', 'unknown')}), {result['api_time']:.2f}s - {outcome}"
+        )
         
-        chunk_results.append(result)
-        progress_bar.progress((i + 1) / len(chunks))
+        job['chunk_results'][i] = result
+        job['completed'] += 1
     
-    transcription_time = time.time() - transcription_start
-    st.info(f"⏱️ Total transcription time: {transcription_time:.2f} seconds")
+    job['timings']['Transcription'] = clock() - phase_start
     
-    # Combine transcriptions
-    st.markdown("### 🔗 Combining Results")
-    combining_start = time.time()
+    # Release chunk audio now rather than whenever the raised GC threshold is hit
+    del results
+    gc.collect()
     
-    status_text.text("🔄 Combining transcriptions...")
-    combined_result = transcription_processor.combine_transcriptions(chunk_results)
+    phase_start = clock()
+    combined_result = transcription_processor.combine_transcriptions(job['chunk_results'])
+    job['timings']['Combining'] = clock() - phase_start
     
-    combining_time = time.time() - combining_start
-    st.info(f"⏱️ Combining took {combining_time:.2f} seconds")
+    job['total_time'] = clock() - job['init_start']
+    return combined_result
+
+
+def display_transcription_progress(job: Dict[str, Any]):
+    """Show the progress of a running background transcription job"""
+    st.markdown("### 🎯 Transcribing Audio")
+    
+    completed, total_chunks = job['completed'], job['total_chunks']
+    st.progress(completed / total_chunks)
+    if not job['future'].running():
+        # Jobs share a few worker threads across all sessions
+        st.text("⏳ Queued behind other transcriptions; this one starts when a worker is free")
+    elif completed:
+        st.text(f"🔄 {completed} of {total_chunks} chunks transcribed")
+    else:
+        st.text(f"🔄 Transcribing {total_chunks} chunks (up to {job['max_concurrent_requests']} at a time)")
+    if job['log_lines']:
+        st.code("\n".join(job['log_lines'][-5:]))
+
+
+def summarize_job(job: Dict[str, Any], combined_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Collect what display_job_summary shows about a finished job
+    
+    Kept in session state next to the result path so the summary survives
+    later reruns; only small per-chunk rows are kept, not the chunk results.
+    """
+    chunk_results = job['chunk_results']
+    return {
+        'chunk_rows': [
+            {
+                'Chunk': r['chunk_index'] + 1,
+                'Duration (s)': round(r['chunk_metadata']['duration'], 1),
+                'Method': r['chunk_metadata'].get('split_method', 'unknown'),
+                'Upload (MB)': round(r['file_size_mb'], 2),
+                'API Time (s)': round(r['api_time'], 2),
+                'Characters': len(r['text']) if r['success'] else None,
+                'Error': None if r['success'] else r.get('error', 'Unknown error')
+            }
+            for r in chunk_results
+        ],
+        'failed': sum(1 for r in chunk_results if not r['success']),
+        'total_chunks': job['total_chunks'],
+        'total_time': job['total_time'],
+        'timings': dict(job['timings']),
+        'text_length': len(combined_result['text']) if combined_result and combined_result['success'] else None
+    }
+
+
+def display_job_summary(summary: Dict[str, Any]):
+    """Show per-chunk results and timings of a finished transcription job (see summarize_job)"""
+    chunk_rows = summary['chunk_rows']
+    total_chunks = summary['total_chunks']
+    failed = summary['failed']
+    
+    st.markdown("### 🔗 Combining Results")
+    with st.expander("📋 Per-chunk Results", expanded=False):
+        st.dataframe(chunk_rows, use_container_width=True, hide_index=True)
+    
+    if failed:
+        st.error(f"❌ {failed} of {total_chunks} chunks failed - see the per-chunk results for details")
     
     # Final status
-    total_time = time.time() - init_start
-    progress_bar.progress(1.0)
-    status_text.text("✅ Transcription complete!")
-    time_text.text(f"⏱️ Total processing time: {total_time:.2f} seconds")
+    total_time = summary['total_time']
+    st.text("✅ Transcription complete!")
+    st.text(f"⏱️ Total processing time: {total_time:.2f} seconds")
     
     # Show processing summary
     with st.expander("📈 Processing Summary", expanded=True):
@@ -388,21 +658,76 @@ def process_transcription(uploaded_file, settings: Dict[str, Any]):
         with col1:
             st.metric("Total Time", f"{total_time:.1f}s")
         with col2:
-            st.metric("Chunks Processed", len(chunks))
+            st.metric("Chunks Processed", len(chunk_rows))
         with col3:
-            successful_chunks = sum(1 for r in chunk_results if r['success'])
-            st.metric("Success Rate", f"{successful_chunks}/{len(chunks)}")
+            st.metric("Success Rate", f"{total_chunks - failed}/{len(chunk_rows)}")
         with col4:
-            if combined_result['success']:
-                st.metric("Final Text Length", f"{len(combined_result['text'])} chars")
+            if summary['text_length'] is not None:
+                st.metric("Final Text Length", f"{summary['text_length']} chars")
             else:
                 st.metric("Status", "Failed")
+        
+        st.dataframe(
+            [{'Phase': phase, 'Seconds': round(seconds, 2)} for phase, seconds in summary['timings'].items()],
+            hide_index=True
+        )
+
+
+def poll_transcription_job() -> bool:
+    """
+    Check on this session's background transcription job
+    
+    Stores the result and its summary once the job is done; main() renders
+    both. Returns True while the job is still running, in which case the
+    caller should rerun shortly.
+    """
+    job = st.session_state.transcription_job
+    if not job['future'].done():
+        display_transcription_progress(job)
+        return True
+    
+    st.session_state.transcription_job = None
+    try:
+        result = job['future'].result()
+    except Exception as e:
+        st.error(f"❌ Transcription failed: {str(e)}")
+        result = None
+        st.session_state.job_summary = None
+    else:
+        st.session_state.job_summary = summarize_job(job, result)
     
-    return combined_result
+    st.session_state.transcription_result_path = save_transcription_result(result)
+    st.session_state.failed_chunks = result.get('failed_chunks', 0) if result else 0
+    st.session_state.processing_complete = True
+    return False
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _export_transcription(result_key: str, export_format: str, show_timestamps: bool,
+                          _result: Dict[str, Any]) -> str:
+    """Render a transcription in one export format, cached per stored result"""
+    exporter = TranscriptionExporter()
+    if export_format == "txt":
+        return exporter.export_to_txt(_result, show_timestamps)
+    if export_format == "srt":
+        return exporter.export_to_srt(_result)
+    if export_format == "vtt":
+        return exporter.export_to_vtt(_result)
+    return exporter.export_to_json(_result)
 
 
-def display_transcription_result(result: Dict[str, Any], settings: Dict[str, Any]):
-    """Display transcription results"""
+@_fragment
+def display_transcription_result(result: Dict[str, Any], settings: Dict[str, Any], result_key: str):
+    """
+    Display transcription results
+    
+    Runs as a fragment, so paging through the transcript reruns only this section.
+    
+    Args:
+        result: Combined transcription result
+        settings: Sidebar settings
+        result_key: Stable identifier of the stored result, used to cache exports
+    """
     if not result or not result.get('success', False):
         st.error("❌ Transcription failed")
         if result and result.get('error'):
@@ -418,7 +743,8 @@ def display_transcription_result(result: Dict[str, Any], settings: Dict[str, Any
         st.metric("Duration", f"{result['total_duration']:.1f}s")
     
     with col2:
-        word_count = len(result['text'].split())
+        # Counted once when chunks are combined, not on every rerun
+        word_count = result['word_count']
         st.metric("Word Count", word_count)
     
     with col3:
@@ -433,17 +759,25 @@ def display_transcription_result(result: Dict[str, Any], settings: Dict[str, Any
     # Display transcription text
     st.markdown("### 📄 Transcription")
     
-    # Format transcription
-    formatted_text = result['text']
-    if settings['show_timestamps'] and result.get('segments'):
-        processor = TranscriptionProcessor()
-        formatted_text = processor.format_transcription_with_timestamps(result, True)
+    # Same text as the TXT export, so it comes from the export cache
+    formatted_text = _export_transcription(result_key, "txt", settings['show_timestamps'], result)
     
-    # Display in expandable text area
+    # Long transcripts are shown a page at a time so each rerun only sends one page
     with st.expander("View Full Transcription", expanded=True):
+        page_count = max(1, (len(formatted_text) + TRANSCRIPT_PAGE_CHARS - 1) // TRANSCRIPT_PAGE_CHARS)
+        page = 1
+        if page_count > 1:
+            page = st.number_input(
+                f"Page (of {page_count})",
+                min_value=1,
+                max_value=page_count,
+                value=1,
+                help="The download buttons below contain the full transcription"
+            )
+        page_start = (page - 1) * TRANSCRIPT_PAGE_CHARS
         st.text_area(
             "Transcription",
-            value=formatted_text,
+            value=formatted_text[page_start:page_start + TRANSCRIPT_PAGE_CHARS],
             height=400,
             disabled=True
         )
@@ -454,40 +788,39 @@ def display_transcription_result(result: Dict[str, Any], settings: Dict[str, Any
     exporter = TranscriptionExporter()
     base_filename = "transcription"
     
+    # Exports are cached per stored result, so reruns don't rebuild all four
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        txt_content = exporter.export_to_txt(result, settings['show_timestamps'])
         st.download_button(
             "📄 Download TXT",
-            data=txt_content,
+            data=_export_transcription(result_key, "txt", settings['show_timestamps'], result),
             file_name=exporter.get_export_filename(base_filename, "txt"),
             mime="text/plain"
         )
     
     with col2:
-        srt_content = exporter.export_to_srt(result)
         st.download_button(
             "🎬 Download SRT",
-            data=srt_content,
+            data=_export_transcription(result_key, "srt", settings['show_timestamps'], result),
             file_name=exporter.get_export_filename(base_filename, "srt"),
-            mime="text/plain"
+            mime="text/plain",
+            disabled=not result.get('segments')
         )
     
     with col3:
-        vtt_content = exporter.export_to_vtt(result)
         st.download_button(
             "🌐 Download VTT",
-            data=vtt_content,
+            data=_export_transcription(result_key, "vtt", settings['show_timestamps'], result),
             file_name=exporter.get_export_filename(base_filename, "vtt"),
-            mime="text/vtt"
+            mime="text/vtt",
+            disabled=not result.get('segments')
         )
     
     with col4:
-        json_content = exporter.export_to_json(result)
         st.download_button(
             "📊 Download JSON",
-            data=json_content,
+            data=_export_transcription(result_key, "json", settings['show_timestamps'], result),
             file_name=exporter.get_export_filename(base_filename, "json"),
             mime="application/json"
         )
@@ -496,10 +829,6 @@ def display_transcription_result(result: Dict[str, Any], settings: Dict[str, Any
 def create_test_audio():
     """Create a small test audio file for debugging"""
     try:
-        from pydub import AudioSegment
-        import tempfile
-        import os
-        
         st.info("🎵 Creating test audio file...")
         
         # Create a 5-second test audio with some speech-like content
@@ -510,27 +839,22 @@ def create_test_audio():
         test_audio += AudioSegment.sine(880, duration=1000)  # 1 second higher tone
         test_audio += AudioSegment.silent(duration=1000)  # 1 second silence
         
-        # Export to temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-        test_audio.export(temp_file.name, format='wav')
+        # Export in memory; nothing needs to touch the disk
+        audio_buffer = io.BytesIO()
+        test_audio.export(audio_buffer, format='wav')
         
-        st.success(f"✅ Test audio created: {temp_file.name}")
+        st.success("✅ Test audio created in memory")
         st.info(f"📊 Test file info:")
         st.info(f"   - Duration: {len(test_audio) / 1000:.1f} seconds")
-        st.info(f"   - Size: {os.path.getsize(temp_file.name) / 1024:.1f} KB")
+        st.info(f"   - Size: {audio_buffer.getbuffer().nbytes / 1024:.1f} KB")
         st.info(f"   - Format: WAV")
         
-        # Clean up
-        os.unlink(temp_file.name)
-        
     except Exception as e:
         st.error(f"❌ Failed to create test audio: {str(e)}")
 
 def test_api_connection(api_key: str):
     """Test OpenAI API connection"""
     try:
-        from whisper_client import WhisperClient
-        
         st.info("🔍 Testing OpenAI API connection...")
         
         client = WhisperClient(api_key=api_key, model="whisper-1")
@@ -577,19 +901,38 @@ def main():
         if st.button("🔍 Test API Connection"):
             test_api_connection(settings['api_key'])
     
+    job_running = st.session_state.transcription_job is not None
+    
     if uploaded_file is not None:
         # Process button
-        if st.button("🚀 Start Transcription", type="primary"):
-            with st.spinner("Processing your audio file..."):
-                result = process_transcription(uploaded_file, settings)
-                st.session_state.transcription_result = result
-                st.session_state.processing_complete = True
+        start = st.button("🚀 Start Transcription", type="primary", disabled=job_running)
         
+        # Successful chunks are served from the result cache, so re-running
+        # with the same file and settings only re-sends the failed ones
+        resume = st.session_state.failed_chunks > 0 and st.sidebar.button(
+            f"🔁 Resume {st.session_state.failed_chunks} Failed Chunks Only",
+            help="Re-run with the same settings; chunks that already succeeded are not re-uploaded",
+            disabled=job_running
+        )
+        
+        if start or resume:
+            with st.spinner("Preparing your audio file..."):
+                st.session_state.transcription_job = process_transcription(uploaded_file, settings)
+    
+    # The upload itself runs in the background; poll it without blocking the page
+    job_running = st.session_state.transcription_job is not None and poll_transcription_job()
+    
+    if uploaded_file is not None:
         # Display results if processing is complete
-        if st.session_state.processing_complete and st.session_state.transcription_result:
-            display_transcription_result(st.session_state.transcription_result, settings)
+        if not job_running and st.session_state.processing_complete and st.session_state.job_summary:
+            display_job_summary(st.session_state.job_summary)
+        if not job_running and st.session_state.processing_complete and st.session_state.transcription_result_path:
+            display_transcription_result(
+                load_transcription_result(st.session_state.transcription_result_path), settings,
+                st.session_state.transcription_result_path
+            )
     
-    # Footer
+    # Footer (rendered last so it does not move while results stream in)
     st.markdown("---")
     st.markdown("""
     <div style="text-align: center; color: #666; margin-top: 2rem;">
@@ -597,6 +940,10 @@ def main():
         <p>For support or feedback, please contact the development team</p>
     </div>
     """, unsafe_allow_html=True)
+    
+    if job_running:
+        time.sleep(JOB_POLL_INTERVAL_SECONDS)
+        st.rerun()
 
 
 if __name__ == "__main__":
@@ -4,22 +4,29 @@ Optimized for Streamlit Cloud deployment with enhanced debugging
 """
 
 import streamlit as st
+import gc
 import os
 import time
-import tempfile
 import traceback
-from typing import Optional, Dict, Any
+import uuid
+from collections import deque
+from typing import Optional, Dict, Any, Tuple, TYPE_CHECKING
 
-# Import our custom modules
+# Import our custom modules. The audio and API modules (pydub, numpy, openai)
+# are imported where first used so the page paints sooner on a cold start
 try:
-    from audio_processor import AudioProcessor
-    from whisper_client import WhisperClient
     from transcription_utils import TranscriptionProcessor, TranscriptionExporter
-    st.success("✅ All modules imported successfully")
+    from config import Config
 except ImportError as e:
     st.error(f"❌ Import error: {str(e)}")
     st.stop()
 
+if TYPE_CHECKING:
+    from audio_processor import AudioProcessor
+
+# Language choices shown in the sidebar, built once rather than on every rerun
+LANGUAGES = tuple(Config.LANGUAGE_OPTIONS)
+
 # Page configuration
 st.set_page_config(
     page_title="Audio Transcription App",
@@ -29,7 +36,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -59,27 +66,54 @@ st.markdown("""
         border-left: 4px solid #dc3545;
         margin: 1rem 0;
     }
-    .debug-box {
-        background-color: #fff3cd;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #ffc107;
-        margin: 1rem 0;
-        font-family: monospace;
-        font-size: 0.9rem;
-    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+HEADER_HTML = f"""
+<h1 class="main-header">🎤 Audio Transcription App</h1>
+<div class="info-box">
+    <strong>Powered by OpenAI Whisper</strong><br>
+    {"🌐 <strong>Cloud Deployment</strong>" if os.getenv("STREAMLIT_CLOUD") else "💻 <strong>Local Development</strong>"}<br>
+    Upload audio files of any size and get accurate transcriptions with timestamps. 
+    Large files are automatically split into chunks for optimal processing.
+</div>
+"""
+
+# Styling and header are static, so the markup sent on every rerun is built once
+HEADER_MARKUP = PAGE_CSS + HEADER_HTML
+
+# Debug messages kept per session; older ones are dropped
+DEBUG_LOG_MAX_LINES = 200
+
+# Lets a part of the page rerun on its own when only its widgets change
+# (st.experimental_fragment from Streamlit 1.33; older versions rerun the whole script)
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', lambda func: func)
+
+# Characters of transcript shown per page in the results view
+TRANSCRIPT_PAGE_CHARS = 5000
+
+# Minimum time between transcription progress updates sent to the page
+PROGRESS_UPDATE_INTERVAL_SECONDS = 0.1
+
+
+def _debug_log() -> deque:
+    """This session's buffer of recent debug messages"""
+    if 'debug_log' not in st.session_state:
+        st.session_state.debug_log = deque(maxlen=DEBUG_LOG_MAX_LINES)
+    return st.session_state.debug_log
 
 
 def log_debug(message: str, level: str = "INFO"):
-    """Enhanced logging for cloud debugging"""
-    timestamp = time.strftime("%H:%M:%S")
-    st.markdown(f"""
-    <div class="debug-box">
-        <strong>[{timestamp}] {level}:</strong> {message}
-    </div>
-    """, unsafe_allow_html=True)
+    """Record a debug message; shown in one block by display_debug_log"""
+    _debug_log().append(f"[{time.strftime('%H:%M:%S')}] {level}: {message}")
+
+
+def display_debug_log():
+    """Render the buffered debug messages when debug mode is on"""
+    if st.session_state.get('debug_mode'):
+        with st.expander("🐛 Debug Log", expanded=False):
+            st.code("\n".join(_debug_log()))
 
 
 def initialize_session_state():
@@ -88,6 +122,8 @@ def initialize_session_state():
     
     if 'transcription_result' not in st.session_state:
         st.session_state.transcription_result = None
+    if 'transcription_result_key' not in st.session_state:
+        st.session_state.transcription_result_key = None
     if 'processing_complete' not in st.session_state:
         st.session_state.processing_complete = False
     if 'temp_files' not in st.session_state:
@@ -98,24 +134,41 @@ def initialize_session_state():
     log_debug("Session state initialized successfully")
 
 
-def get_api_key() -> Optional[str]:
-    """Get OpenAI API key with cloud debugging"""
-    log_debug("Attempting to get API key")
+@st.cache_data(ttl=300, show_spinner=False)
+def _configured_api_key() -> Tuple[Optional[str], str]:
+    """
+    Look up the deployment's API key in secrets or the environment
     
+    Returns:
+        Tuple of (api_key, description of where it was found or why not)
+    """
     # Try Streamlit secrets first (for cloud deployment)
+    secrets_note = ""
     try:
         api_key = st.secrets.get("OPENAI_API_KEY")
         if api_key:
-            log_debug("✅ API key found in Streamlit secrets")
-            return api_key
+            return api_key, "Streamlit secrets"
     except Exception as e:
-        log_debug(f"⚠️ Streamlit secrets error: {str(e)}", "WARNING")
+        secrets_note = f"Streamlit secrets error: {str(e)}"
     
     # Try environment variable (for local development)
     api_key = os.getenv("OPENAI_API_KEY")
     if api_key:
-        log_debug("✅ API key found in environment variables")
+        return api_key, "environment variables"
+    
+    return None, secrets_note
+
+
+def get_api_key() -> Optional[str]:
+    """Get OpenAI API key with cloud debugging"""
+    log_debug("Attempting to get API key")
+    
+    api_key, source = _configured_api_key()
+    if api_key:
+        log_debug(f"✅ API key found in {source}")
         return api_key
+    if source:
+        log_debug(f"⚠️ {source}", "WARNING")
     
     # Try manual API key from session state
     if hasattr(st.session_state, 'manual_api_key') and st.session_state.manual_api_key:
@@ -126,20 +179,15 @@ def get_api_key() -> Optional[str]:
     return None
 
 
+def cleanup_session_temp_files(audio_processor: 'AudioProcessor'):
+    """Delete temporary files tracked in session state"""
+    audio_processor.cleanup_temp_files(st.session_state.temp_files)
+    st.session_state.temp_files = []
+
+
 def display_header():
-    """Display application header with cloud info"""
-    st.markdown('<h1 class="main-header">🎤 Audio Transcription App</h1>', unsafe_allow_html=True)
-    
-    # Show deployment info
-    deployment_info = "🌐 **Cloud Deployment**" if os.getenv("STREAMLIT_CLOUD") else "💻 **Local Development**"
-    st.markdown(f"""
-    <div class="info-box">
-        <strong>Powered by OpenAI Whisper</strong><br>
-        {deployment_info}<br>
-        Upload audio files of any size and get accurate transcriptions with timestamps. 
-        Large files are automatically split into chunks for optimal processing.
-    </div>
-    """, unsafe_allow_html=True)
+    """Display application header with cloud info, along with the page styling"""
+    st.markdown(HEADER_MARKUP, unsafe_allow_html=True)
 
 
 def display_sidebar():
@@ -189,26 +237,12 @@ def display_sidebar():
         # Language selection
         language = st.selectbox(
             "Language (optional)",
-            ["Auto-detect", "English", "Spanish", "French", "German", "Italian", 
-             "Portuguese", "Russian", "Japanese", "Korean", "Chinese"],
+            LANGUAGES,
             help="Leave as 'Auto-detect' for automatic language detection"
         )
         
         # Convert language selection to code
-        language_codes = {
-            "Auto-detect": None,
-            "English": "en",
-            "Spanish": "es", 
-            "French": "fr",
-            "German": "de",
-            "Italian": "it",
-            "Portuguese": "pt",
-            "Russian": "ru",
-            "Japanese": "ja",
-            "Korean": "ko",
-            "Chinese": "zh"
-        }
-        selected_language = language_codes[language]
+        selected_language = Config.LANGUAGE_OPTIONS[language]
         
         # Advanced settings
         with st.expander("Advanced Settings"):
@@ -225,7 +259,7 @@ def display_sidebar():
                 min_value=1,
                 max_value=5,
                 value=3,
-                help="Overlap between chunks to avoid word cutoffs"
+                help="Overlap added at chunk cuts that could not be placed in silence, to avoid word cutoffs"
             )
             
             show_timestamps = st.checkbox(
@@ -239,6 +273,38 @@ def display_sidebar():
                 value=False,
                 help="Skip silence detection and use time-based splitting (faster for large files)"
             )
+            
+            use_numpy_vad = st.checkbox(
+                "Fast silence detection",
+                value=True,
+                help="Detect silence with vectorized NumPy energy analysis instead of ffmpeg's silencedetect filter"
+            )
+            
+            use_opus = st.checkbox(
+                "Encode chunks as Opus",
+                value=True,
+                help="Upload chunks as 24kbps OGG/Opus instead of 64kbps MP3 (much smaller uploads)"
+            )
+            
+            include_word_timestamps = st.checkbox(
+                "Word-level timestamps",
+                value=False,
+                help="Request per-word timings for the JSON export (makes API responses several times larger)"
+            )
+            
+            text_only = st.checkbox(
+                "Text only (no timestamps)",
+                value=False,
+                help="Fastest option: request plain text without segment timings (disables SRT/VTT export)"
+            )
+            
+            max_concurrent_requests = st.slider(
+                "Parallel API requests",
+                min_value=1,
+                max_value=16,
+                value=Config.MAX_CONCURRENT_REQUESTS,
+                help="How many chunks are transcribed at once; lower this if you hit rate limits"
+            )
         
         # App information
         st.markdown("---")
@@ -260,6 +326,11 @@ def display_sidebar():
             'overlap_seconds': overlap_seconds,
             'show_timestamps': show_timestamps,
             'force_time_based': force_time_based,
+            'use_numpy_vad': use_numpy_vad,
+            'use_opus': use_opus,
+            'include_word_timestamps': include_word_timestamps,
+            'text_only': text_only,
+            'max_concurrent_requests': max_concurrent_requests,
             'debug_mode': debug_mode
         }
 
@@ -284,151 +355,241 @@ def process_transcription(uploaded_file, settings: Dict[str, Any]):
     """Process audio transcription with comprehensive cloud debugging"""
     log_debug("Starting transcription process")
     
-    try:
-        # Initialize components
-        st.markdown("### 🔧 Initializing Components")
-        init_start = time.time()
-        
-        log_debug("Creating AudioProcessor")
-        audio_processor = AudioProcessor(
-            max_chunk_size_mb=settings['chunk_size'],
-            overlap_seconds=settings['overlap_seconds'],
-            force_time_based=settings['force_time_based']
-        )
-        st.info(f"✅ Audio processor initialized (chunk size: {settings['chunk_size']}MB, overlap: {settings['overlap_seconds']}s)")
-        
-        log_debug("Creating WhisperClient")
-        whisper_client = WhisperClient(
-            api_key=settings['api_key'],
-            model="whisper-1"
-        )
-        st.info("✅ Whisper client initialized")
-        
-        log_debug("Creating TranscriptionProcessor and Exporter")
-        transcription_processor = TranscriptionProcessor()
-        exporter = TranscriptionExporter()
-        st.info("✅ Transcription utilities initialized")
-        
-        init_time = time.time() - init_start
-        st.success(f"🚀 All components ready in {init_time:.2f} seconds")
-        log_debug(f"Component initialization completed in {init_time:.2f}s")
-        
-        # Validate and process audio file
-        st.markdown("### 🔍 Validating Audio File")
-        validation_start = time.time()
-        
-        st.info(f"📁 Processing file: {uploaded_file.name} ({uploaded_file.size / (1024*1024):.1f} MB)")
-        log_debug(f"Validating file: {uploaded_file.name}")
-        
-        is_valid, error_msg, audio_segment = audio_processor.validate_audio_file(uploaded_file)
-        
-        validation_time = time.time() - validation_start
-        st.info(f"⏱️ Validation took {validation_time:.2f} seconds")
-        log_debug(f"File validation completed in {validation_time:.2f}s")
-        
-        if not is_valid:
-            st.error(f"❌ {error_msg}")
-            log_debug(f"File validation failed: {error_msg}", "ERROR")
-            return None
-        
-        st.success("✅ Audio file validated successfully")
-        log_debug("File validation successful")
-        
-        # Split audio into chunks
-        st.markdown("### 🔄 Processing Audio")
-        chunking_start = time.time()
-        
-        st.info("🔄 Starting intelligent audio chunking...")
-        log_debug("Starting audio chunking process")
-        
-        chunks = audio_processor.split_audio_intelligently(audio_segment)
-        
-        chunking_time = time.time() - chunking_start
-        st.info(f"⏱️ Chunking took {chunking_time:.2f} seconds")
-        st.success(f"📦 Audio split into {len(chunks)} chunks")
-        log_debug(f"Audio chunking completed: {len(chunks)} chunks in {chunking_time:.2f}s")
-        
-        # Transcribe chunks
-        st.markdown("### 🎯 Transcribing Audio")
-        
-        # Create progress bar and status
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        time_text = st.empty()
-        
-        chunk_results = []
-        transcription_start = time.time()
-        
-        for i, chunk_data in enumerate(chunks):
-            chunk_start_time = time.time()
-            status_text.text(f"🔄 Processing chunk {i + 1} of {len(chunks)}")
-            
-            # Show chunk info
-            chunk, metadata = chunk_data
-            st.info(f"📦 Chunk {i+1}: {metadata['duration']:.1f}s, method: {metadata.get('split_method', 'unknown')}")
-            log_debug(f"Processing chunk {i+1}: {metadata['duration']:.1f}s")
-            
-            # Transcribe chunk
-            result = whisper_client.transcribe_chunk(
-                chunk_data, i, len(chunks), 
-                language=settings['language']
+    # One status block whose label tracks the current phase; step details go
+    # to the debug log instead of a new page element per step and per chunk
+    with st.status("🔧 Initializing components...", expanded=settings['debug_mode']) as status:
+        try:
+            init_start = time.time()
+            
+            from audio_processor import AudioProcessor, OPUS_BITRATE_KBPS, MP3_BITRATE_KBPS
+            from whisper_client import WhisperClient
+            log_debug("Audio and Whisper modules loaded")
+            
+            log_debug("Creating AudioProcessor")
+            audio_processor = AudioProcessor(
+                max_chunk_size_mb=settings['chunk_size'],
+                overlap_seconds=settings['overlap_seconds'],
+                force_time_based=settings['force_time_based'],
+                use_numpy_vad=settings['use_numpy_vad'],
+                upload_bitrate_kbps=OPUS_BITRATE_KBPS if settings['use_opus'] else MP3_BITRATE_KBPS
             )
+            log_debug(f"Audio processor initialized (chunk size: {settings['chunk_size']}MB, overlap: {settings['overlap_seconds']}s)")
             
-            chunk_time = time.time() - chunk_start_time
-            time_text.text(f"⏱️ Chunk {i+1} completed in {chunk_time:.2f}s")
+            log_debug("Creating WhisperClient")
+            whisper_client = WhisperClient(
+                api_key=settings['api_key'],
+                model="whisper-1",
+                use_opus=settings['use_opus'],
+                # Chunks finish on worker threads; failed chunks' attempt logs go to the debug log below
+                verbose=False,
+                max_concurrent_requests=settings['max_concurrent_requests'],
+                include_word_timestamps=settings['include_word_timestamps'],
+                text_only=settings['text_only']
+            )
             
-            # Show result
-            if result['success']:
-                st.success(f"✅ Chunk {i+1} transcribed: {len(result['text'])} characters")
-                log_debug(f"Chunk {i+1} transcribed successfully: {len(result['text'])} chars")
+            log_debug("Creating TranscriptionProcessor")
+            transcription_processor = TranscriptionProcessor()
+            
+            init_time = time.time() - init_start
+            log_debug(f"Component initialization completed in {init_time:.2f}s")
+            
+            # Validate and process audio file
+            status.update(label=f"🔍 Validating {uploaded_file.name} ({uploaded_file.size / (1024*1024):.1f} MB)...")
+            validation_start = time.time()
+            log_debug(f"Validating file: {uploaded_file.name}")
+            
+            # Reject bad uploads before copying or hashing them
+            is_valid, error_msg = audio_processor.validate_upload(uploaded_file)
+            if not is_valid:
+                st.error(f"❌ {error_msg}")
+                log_debug(f"Upload rejected: {error_msg}", "ERROR")
+                status.update(label="❌ Upload rejected", state="error", expanded=True)
+                return None
+            
+            file_hash = audio_processor.compute_upload_hash(uploaded_file)
+            
+            # Small uploads are sent as they are; decoding them would only cost time
+            if audio_processor.fits_single_request(uploaded_file):
+                log_debug("Upload within single-request limit, sending without decoding")
+                
+                # Headers are still checked so unreadable files never reach the API
+                is_valid, error_msg, duration = audio_processor.probe_upload(uploaded_file)
+                if not is_valid:
+                    st.error(f"❌ {error_msg}")
+                    log_debug(f"File validation failed: {error_msg}", "ERROR")
+                    status.update(label="❌ File validation failed", state="error", expanded=True)
+                    return None
+                log_debug(f"Probed duration: {duration:.2f}s")
+                
+                status.update(label="🎯 Transcribing in a single request...")
+                result = whisper_client.transcribe_upload(uploaded_file, file_hash,
+                                                          language=settings['language'], duration=duration)
+                if result['success']:
+                    log_debug(f"Single request transcribed successfully: {len(result['text'])} chars")
+                else:
+                    st.error(f"❌ Transcription failed: {result.get('error', 'Unknown error')}")
+                    log_debug(f"Single request failed: {result.get('error', 'Unknown error')}", "ERROR")
+                    for line in result.get('attempt_log', ()):
+                        log_debug(f"Single request: {line}")
+                
+                combined_result = transcription_processor.combine_transcriptions([result])
+                
+                total_time = time.time() - init_start
+                log_debug(f"Total processing time: {total_time:.2f}s")
+                if result['success']:
+                    status.update(label=f"✅ Transcription complete in {total_time:.2f}s", state="complete")
+                else:
+                    status.update(label="❌ Transcription failed", state="error", expanded=True)
+                
+                return combined_result
+            
+            # Remove files left behind by an interrupted run. Only formats that need
+            # ffmpeg are streamed to disk; the rest are decoded from the upload's buffer
+            cleanup_session_temp_files(audio_processor)
+            audio_source = uploaded_file
+            if audio_processor.needs_disk_copy(uploaded_file):
+                audio_source = audio_processor.save_uploaded_file(uploaded_file)
+                st.session_state.temp_files.append(audio_source)
+                log_debug(f"Upload streamed to {audio_source}")
             else:
-                st.error(f"❌ Chunk {i+1} failed: {result.get('error', 'Unknown error')}")
-                log_debug(f"Chunk {i+1} failed: {result.get('error', 'Unknown error')}", "ERROR")
+                log_debug("Decoding upload in memory")
             
-            chunk_results.append(result)
-            progress_bar.progress((i + 1) / len(chunks))
-        
-        transcription_time = time.time() - transcription_start
-        st.info(f"⏱️ Total transcription time: {transcription_time:.2f} seconds")
-        log_debug(f"Transcription completed in {transcription_time:.2f}s")
-        
-        # Combine transcriptions
-        st.markdown("### 🔗 Combining Results")
-        combining_start = time.time()
-        
-        status_text.text("🔄 Combining transcriptions...")
-        log_debug("Combining transcription results")
-        
-        combined_result = transcription_processor.combine_transcriptions(chunk_results)
-        
-        combining_time = time.time() - combining_start
-        st.info(f"⏱️ Combining took {combining_time:.2f} seconds")
-        log_debug(f"Result combination completed in {combining_time:.2f}s")
-        
-        # Final status
-        total_time = time.time() - init_start
-        progress_bar.progress(1.0)
-        status_text.text("✅ Transcription complete!")
-        time_text.text(f"⏱️ Total processing time: {total_time:.2f} seconds")
-        
-        log_debug(f"Total processing time: {total_time:.2f}s")
-        
-        return combined_result
-        
-    except Exception as e:
-        error_msg = f"Transcription process failed: {str(e)}"
-        st.error(f"❌ {error_msg}")
-        log_debug(error_msg, "ERROR")
-        
-        if st.session_state.debug_mode:
-            st.markdown("### 🐛 Debug Information")
-            st.code(traceback.format_exc())
-        
+            is_valid, error_msg, upload_audio, _ = audio_processor.validate_audio_file(audio_source, file_hash)
+            
+            validation_time = time.time() - validation_start
+            log_debug(f"File validation completed in {validation_time:.2f}s")
+            
+            if not is_valid:
+                st.error(f"❌ {error_msg}")
+                log_debug(f"File validation failed: {error_msg}", "ERROR")
+                cleanup_session_temp_files(audio_processor)
+                status.update(label="❌ File validation failed", state="error", expanded=True)
+                return None
+            
+            log_debug("File validation successful")
+            
+            # Split audio into chunks
+            status.update(label="🔄 Splitting audio into chunks...")
+            chunking_start = time.time()
+            log_debug("Starting audio chunking process")
+            
+            chunk_plan = audio_processor.plan_chunks_cached(upload_audio, file_hash)
+            total_chunks = len(chunk_plan)
+            
+            chunking_time = time.time() - chunking_start
+            log_debug(f"Audio chunking completed: {total_chunks} chunks in {chunking_time:.2f}s")
+            
+            # Transcribe chunks
+            status.update(label=f"🎯 Transcribing {total_chunks} chunks "
+                                f"(up to {whisper_client.max_concurrent_requests} at a time)...")
+            progress_bar = st.progress(0)
+            
+            chunk_results = [None] * total_chunks
+            completed = 0
+            failed = 0
+            transcription_start = last_progress_update = time.time()
+            
+            # Chunks are sliced lazily and transcribed concurrently; results arrive in
+            # completion order and are placed by chunk index
+            chunks = audio_processor.iter_chunks(upload_audio, chunk_plan)
+            for result in whisper_client.transcribe_chunks_concurrent(chunks, language=settings['language'],
+                                                                      total_chunks=total_chunks):
+                i = result['chunk_index']
+                metadata = result['chunk_metadata']
+                completed += 1
+                
+                if result['success']:
+                    log_debug(f"Chunk {i+1} ({metadata['duration']:.1f}s, {metadata.get('split_method', 'unknown')}) "
+                              f"transcribed in {result['api_time']:.2f}s: {len(result['text'])} chars")
+                else:
+                    failed += 1
+                    log_debug(f"Chunk {i+1} failed: {result.get('error', 'Unknown error')}", "ERROR")
+                    for line in result.get('attempt_log', ()):
+                        log_debug(f"Chunk {i+1}: {line}")
+                
+                chunk_results[i] = result
+                
+                # Coalesce bursts of completions into one page update per interval
+                now = time.time()
+                if now - last_progress_update >= PROGRESS_UPDATE_INTERVAL_SECONDS or completed == total_chunks:
+                    status.update(label=f"🎯 {completed} of {total_chunks} chunks transcribed"
+                                        + (f" ({failed} failed)" if failed else "") + "...")
+                    progress_bar.progress(completed / total_chunks)
+                    last_progress_update = now
+            
+            del chunks, upload_audio
+            gc.collect()
+            
+            transcription_time = time.time() - transcription_start
+            log_debug(f"Transcription completed in {transcription_time:.2f}s")
+            
+            # Combine transcriptions
+            status.update(label="🔗 Combining transcriptions...")
+            combining_start = time.time()
+            log_debug("Combining transcription results")
+            
+            combined_result = transcription_processor.combine_transcriptions(chunk_results)
+            
+            combining_time = time.time() - combining_start
+            log_debug(f"Result combination completed in {combining_time:.2f}s")
+            
+            cleanup_session_temp_files(audio_processor)
+            
+            # Final status
+            total_time = time.time() - init_start
+            log_debug(f"Total processing time: {total_time:.2f}s")
+            if failed:
+                st.error(f"❌ {failed} of {total_chunks} chunks failed - see the debug log for details")
+                status.update(label=f"⚠️ Transcription finished in {total_time:.2f}s with {failed} failed chunks",
+                              state="error", expanded=True)
+            else:
+                status.update(label=f"✅ Transcription complete in {total_time:.2f}s", state="complete")
+            
+            return combined_result
+            
+        except Exception as e:
+            error_msg = f"Transcription process failed: {str(e)}"
+            st.error(f"❌ {error_msg}")
+            log_debug(error_msg, "ERROR")
+            
+            if st.session_state.debug_mode:
+                st.markdown("### 🐛 Debug Information")
+                st.code(traceback.format_exc())
+            
+            status.update(label="❌ Transcription failed", state="error", expanded=True)
+            return None
+
+
+def _result_key(result: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Key identifying one transcription run, used to cache its exports
+    
+    Unique per run rather than derived from the result: runs of the same file
+    with other options can share text and segments but differ in words,
+    timings or language.
+    """
+    if not result:
         return None
+    return uuid.uuid4().hex
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _export_transcription(result_key: str, export_format: str, show_timestamps: bool,
+                          _result: Dict[str, Any]) -> str:
+    """Render a transcription in one export format, cached per transcription run"""
+    exporter = TranscriptionExporter()
+    if export_format == "txt":
+        return exporter.export_to_txt(_result, show_timestamps)
+    if export_format == "srt":
+        return exporter.export_to_srt(_result)
+    if export_format == "vtt":
+        return exporter.export_to_vtt(_result)
+    return exporter.export_to_json(_result)
 
 
-def display_transcription_result(result: Dict[str, Any], settings: Dict[str, Any]):
-    """Display transcription results with cloud debugging"""
+@_fragment
+def display_transcription_result(result: Dict[str, Any], settings: Dict[str, Any], result_key: str):
+    """Display transcription results with cloud debugging (as a fragment, so paging reruns only this section)"""
     log_debug("Displaying transcription results")
     
     if not result or not result.get('success', False):
@@ -447,7 +608,8 @@ def display_transcription_result(result: Dict[str, Any], settings: Dict[str, Any
         st.metric("Duration", f"{result['total_duration']:.1f}s")
     
     with col2:
-        word_count = len(result['text'].split())
+        # Counted once when chunks are combined, not on every rerun
+        word_count = result['word_count']
         st.metric("Word Count", word_count)
     
     with col3:
@@ -464,17 +626,25 @@ def display_transcription_result(result: Dict[str, Any], settings: Dict[str, Any
     # Display transcription text
     st.markdown("### 📄 Transcription")
     
-    # Format transcription
-    formatted_text = result['text']
-    if settings['show_timestamps'] and result.get('segments'):
-        processor = TranscriptionProcessor()
-        formatted_text = processor.format_transcription_with_timestamps(result, True)
+    # Same text as the TXT export, so it comes from the export cache
+    formatted_text = _export_transcription(result_key, "txt", settings['show_timestamps'], result)
     
-    # Display in expandable text area
+    # Long transcripts are shown a page at a time so each rerun only sends one page
     with st.expander("View Full Transcription", expanded=True):
+        page_count = max(1, (len(formatted_text) + TRANSCRIPT_PAGE_CHARS - 1) // TRANSCRIPT_PAGE_CHARS)
+        page = 1
+        if page_count > 1:
+            page = st.number_input(
+                f"Page (of {page_count})",
+                min_value=1,
+                max_value=page_count,
+                value=1,
+                help="The download buttons below contain the full transcription"
+            )
+        page_start = (page - 1) * TRANSCRIPT_PAGE_CHARS
         st.text_area(
             "Transcription",
-            value=formatted_text,
+            value=formatted_text[page_start:page_start + TRANSCRIPT_PAGE_CHARS],
             height=400,
             disabled=True
         )
@@ -485,40 +655,39 @@ def display_transcription_result(result: Dict[str, Any], settings: Dict[str, Any
     exporter = TranscriptionExporter()
     base_filename = "transcription"
     
+    # Exports are cached per result, so reruns don't rebuild all four
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        txt_content = exporter.export_to_txt(result, settings['show_timestamps'])
         st.download_button(
             "📄 Download TXT",
-            data=txt_content,
+            data=_export_transcription(result_key, "txt", settings['show_timestamps'], result),
             file_name=exporter.get_export_filename(base_filename, "txt"),
             mime="text/plain"
         )
     
     with col2:
-        srt_content = exporter.export_to_srt(result)
         st.download_button(
             "🎬 Download SRT",
-            data=srt_content,
+            data=_export_transcription(result_key, "srt", settings['show_timestamps'], result),
             file_name=exporter.get_export_filename(base_filename, "srt"),
-            mime="text/plain"
+            mime="text/plain",
+            disabled=not result.get('segments')
         )
     
     with col3:
-        vtt_content = exporter.export_to_vtt(result)
         st.download_button(
             "🌐 Download VTT",
-            data=vtt_content,
+            data=_export_transcription(result_key, "vtt", settings['show_timestamps'], result),
             file_name=exporter.get_export_filename(base_filename, "vtt"),
-            mime="text/vtt"
+            mime="text/vtt",
+            disabled=not result.get('segments')
         )
     
     with col4:
-        json_content = exporter.export_to_json(result)
         st.download_button(
             "📊 Download JSON",
-            data=json_content,
+            data=_export_transcription(result_key, "json", settings['show_timestamps'], result),
             file_name=exporter.get_export_filename(base_filename, "json"),
             mime="application/json"
         )
@@ -531,10 +700,9 @@ def test_api_connection(api_key: str):
     try:
         log_debug("Testing API connection")
         
-        from whisper_client import WhisperClient
-        
         st.info("🔍 Testing OpenAI API connection...")
         
+        from whisper_client import WhisperClient
         client = WhisperClient(api_key=api_key, model="whisper-1")
         
         # Test API key validation
@@ -572,6 +740,7 @@ def main():
         # Display sidebar and get settings
         settings = display_sidebar()
         if not settings:
+            display_debug_log()
             st.stop()
         
         # Display file upload
@@ -590,11 +759,13 @@ def main():
                 with st.spinner("Processing your audio file..."):
                     result = process_transcription(uploaded_file, settings)
                     st.session_state.transcription_result = result
+                    st.session_state.transcription_result_key = _result_key(result)
                     st.session_state.processing_complete = True
             
             # Display results if processing is complete
             if st.session_state.processing_complete and st.session_state.transcription_result:
-                display_transcription_result(st.session_state.transcription_result, settings)
+                display_transcription_result(st.session_state.transcription_result, settings,
+                                             st.session_state.transcription_result_key)
         
         # Footer
         st.markdown("---")
@@ -606,6 +777,7 @@ def main():
         """, unsafe_allow_html=True)
         
         log_debug("Main application completed successfully")
+        display_debug_log()
         
     except Exception as e:
         error_msg = f"Main application failed: {str(e)}"
@@ -615,6 +787,7 @@ def main():
         if st.session_state.debug_mode:
             st.markdown("### 🐛 Debug Information")
             st.code(traceback.format_exc())
+        display_debug_log()
 
 
 if __name__ == "__main__":
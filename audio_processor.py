@@ -4,13 +4,280 @@ Handles audio file validation, chunking, and format conversion
 """
 
 import os
+import re
+import hashlib
+import shutil
+import subprocess
+import time
 import tempfile
 import io
-from typing import List, Tuple, Optional
+import math
+from typing import List, Tuple, Optional, Iterator, Union, BinaryIO, Dict, Any
+import numpy as np
 from pydub import AudioSegment
-from pydub.silence import split_on_silence, detect_silence
+from pydub.exceptions import CouldntDecodeError
+from pydub.utils import db_to_float, ratio_to_db, get_prober_name
 import streamlit as st
 
+try:
+    import soundfile as sf
+except ImportError:  # optional: pydub/ffmpeg decodes everything without it
+    sf = None
+
+try:
+    from blake3 import blake3 as _content_hasher
+except ImportError:  # optional: much faster than sha256 on large uploads
+    _content_hasher = hashlib.sha256
+
+
+# Decoded audio (in its 16kHz mono upload form) and chunk plans are cached per
+# file content so that reruns (and repeated transcriptions of the same upload)
+# skip the ffmpeg decode
+CACHE_TTL_SECONDS = 24 * 60 * 60
+CACHE_MAX_ENTRIES = 4
+
+
+# Whisper resamples everything to 16kHz mono, so chunks are uploaded that way
+WHISPER_FRAME_RATE = 16000
+WHISPER_CHANNELS = 1
+WHISPER_SAMPLE_WIDTH = 2
+
+# Encoded upload bitrates; chunk durations are sized from these up front.
+# Chunks are 16kHz mono speech, where MP3 gains nothing above 64kbps
+OPUS_BITRATE_KBPS = 24
+MP3_BITRATE_KBPS = 64
+
+# Longest chunk planned regardless of size; at Opus bitrates the size limit alone
+# would allow hours per chunk and leave nothing to transcribe in parallel
+MAX_CHUNK_SECONDS = 20 * 60
+
+
+# Longest ffmpeg silencedetect run before giving up and splitting by time
+SILENCE_DETECT_TIMEOUT_SECONDS = 30
+_SILENCEDETECT_RE = re.compile(r'silence_(start|end): (-?[\d.]+)')
+
+
+# Formats libsndfile can decode in-process (MP3 needs libsndfile >= 1.1)
+SOUNDFILE_FORMATS = {'wav', 'flac', 'ogg', 'mp3', 'mpeg', 'mpga'}
+
+
+def _load_audio(source: Union[str, BinaryIO], file_format: str) -> AudioSegment:
+    """Decode audio from a path or file object in-process with libsndfile when possible, otherwise via ffmpeg"""
+    if sf is not None and file_format in SOUNDFILE_FORMATS:
+        try:
+            if not isinstance(source, str):
+                source.seek(0)
+            samples, frame_rate = sf.read(source, dtype='int16', always_2d=True)
+            return AudioSegment(
+                data=samples.tobytes(),
+                sample_width=2,
+                frame_rate=frame_rate,
+                channels=samples.shape[1]
+            )
+        except RuntimeError:
+            pass  # unsupported codec or old libsndfile; let ffmpeg handle it
+    if isinstance(source, str):
+        return _ffmpeg_decode(source)
+    
+    # Spill the upload to disk in blocks and decode it by path; piping it into
+    # ffmpeg would hold extra copies in memory and breaks on MP4-style containers
+    source.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_format}') as temp_file:
+        shutil.copyfileobj(source, temp_file, length=AudioProcessor.COPY_BUFFER_SIZE)
+    try:
+        return _ffmpeg_decode(temp_file.name)
+    finally:
+        os.remove(temp_file.name)
+
+
+def _probe_duration(source: BinaryIO, file_format: str) -> float:
+    """
+    Read an upload's duration in seconds from its headers, without decoding it
+    
+    Uses libsndfile when it reads the format, otherwise ffprobe. Raises
+    CouldntDecodeError when the file is not readable audio.
+    """
+    if sf is not None and file_format in SOUNDFILE_FORMATS:
+        try:
+            source.seek(0)
+            return sf.info(source).duration
+        except RuntimeError:
+            pass  # unsupported codec or old libsndfile; let ffprobe handle it
+    
+    # ffprobe needs a seekable file for MP4-style containers, as ffmpeg does
+    source.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_format}') as temp_file:
+        shutil.copyfileobj(source, temp_file, length=AudioProcessor.COPY_BUFFER_SIZE)
+    try:
+        command = [
+            get_prober_name(), '-v', 'error', '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1', temp_file.name
+        ]
+        process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    finally:
+        os.remove(temp_file.name)
+    try:
+        return float(process.stdout)
+    except ValueError:
+        raise CouldntDecodeError(f"ffprobe could not read the file: {process.stderr.decode('utf-8', 'replace').strip()}")
+
+
+def _ffmpeg_decode(file_path: str) -> AudioSegment:
+    """
+    Decode a file with one ffmpeg call straight to 16kHz mono 16-bit PCM
+    
+    Skips pydub's WAV round trip, and ffmpeg's resampler produces the form
+    chunks are uploaded in, so downmix_for_upload has nothing left to do.
+    """
+    command = [
+        AudioSegment.converter, '-hide_banner', '-loglevel', 'error', '-nostdin',
+        '-i', file_path, '-vn',
+        '-f', 's16le', '-acodec', 'pcm_s16le',
+        '-ac', str(WHISPER_CHANNELS), '-ar', str(WHISPER_FRAME_RATE),
+        'pipe:1'
+    ]
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if process.returncode != 0:
+        raise CouldntDecodeError(f"ffmpeg could not decode the file: {process.stderr.decode('utf-8', 'replace').strip()}")
+    return AudioSegment(
+        data=process.stdout,
+        sample_width=WHISPER_SAMPLE_WIDTH,
+        frame_rate=WHISPER_FRAME_RATE,
+        channels=WHISPER_CHANNELS
+    )
+
+
+def ffmpeg_encode(audio_segment: AudioSegment, file_format: str, codec_args: List[str]) -> bytes:
+    """
+    Encode an AudioSegment with one ffmpeg call, piping PCM in and the encoded file out
+    
+    Unlike pydub's export, no intermediate WAV is written to a temp file.
+    
+    Args:
+        audio_segment: AudioSegment object
+        file_format: ffmpeg output format (e.g. 'mp3', 'ogg')
+        codec_args: Encoder arguments (e.g. ['-c:a', 'libmp3lame', '-b:a', '64k'])
+        
+    Returns:
+        Encoded audio bytes
+    """
+    command = [
+        AudioSegment.converter, '-hide_banner', '-loglevel', 'error', '-nostdin',
+        '-f', f's{audio_segment.sample_width * 8}le',
+        '-ar', str(audio_segment.frame_rate), '-ac', str(audio_segment.channels),
+        '-i', 'pipe:0',
+        *codec_args,
+        '-f', file_format, 'pipe:1'
+    ]
+    process = subprocess.run(command, input=audio_segment.raw_data, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg could not encode the audio: {process.stderr.decode('utf-8', 'replace').strip()}")
+    return process.stdout
+
+
+def _detect_silence_ffmpeg(audio_segment: AudioSegment, silence_thresh: float,
+                           min_silence_len: int) -> List[Tuple[int, int]]:
+    """
+    Find silent stretches with ffmpeg's silencedetect filter
+    
+    The already decoded PCM is piped to ffmpeg rather than re-reading the
+    container, so the detection runs in native code on exactly the audio
+    that gets chunked.
+    
+    Returns:
+        List of (start_ms, end_ms) tuples
+    """
+    command = [
+        AudioSegment.converter, '-hide_banner', '-nostdin', '-nostats',
+        '-f', f's{audio_segment.sample_width * 8}le',
+        '-ar', str(audio_segment.frame_rate), '-ac', str(audio_segment.channels),
+        '-i', 'pipe:0',
+        '-af', f'silencedetect=n={silence_thresh:.2f}dB:d={min_silence_len / 1000:.3f}',
+        '-f', 'null', '-'
+    ]
+    process = subprocess.run(command, input=audio_segment.raw_data, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE, timeout=SILENCE_DETECT_TIMEOUT_SECONDS)
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg silencedetect failed: {process.stderr.decode('utf-8', 'replace').strip()}")
+    
+    total_ms = len(audio_segment)
+    silent_ranges = []
+    start_ms = None
+    for kind, seconds in _SILENCEDETECT_RE.findall(process.stderr.decode('utf-8', 'replace')):
+        position_ms = max(0, int(float(seconds) * 1000))
+        if kind == 'start':
+            start_ms = position_ms
+        elif start_ms is not None:
+            silent_ranges.append((start_ms, min(position_ms, total_ms)))
+            start_ms = None
+    
+    # Silence running to the end of the input is reported without an end
+    if start_ms is not None:
+        silent_ranges.append((start_ms, total_ms))
+    return silent_ranges
+
+
+def _downmix(audio_segment: AudioSegment) -> AudioSegment:
+    """Convert audio to 16kHz mono 16-bit (the same object if already in that form)"""
+    return (audio_segment.set_frame_rate(WHISPER_FRAME_RATE)
+            .set_channels(WHISPER_CHANNELS)
+            .set_sample_width(WHISPER_SAMPLE_WIDTH))
+
+
+def _load_upload_audio(source: Union[str, BinaryIO], file_format: str) -> Tuple[AudioSegment, Dict[str, Any]]:
+    """
+    Decode audio and downmix it to the form chunks are uploaded in
+    
+    The decoded source is dropped as soon as it is downmixed; only its format
+    details are kept, for display.
+    """
+    audio_segment = _load_audio(source, file_format)
+    source_format = {
+        'sample_rate': audio_segment.frame_rate,
+        'channels': audio_segment.channels,
+        'bit_depth': audio_segment.sample_width * 8,
+        'file_size_mb': len(audio_segment.raw_data) / (1024 * 1024)
+    }
+    return _downmix(audio_segment), source_format
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _decode_audio(file_hash: str, file_format: str,
+                  _source: Union[str, BinaryIO]) -> Tuple[AudioSegment, Dict[str, Any]]:
+    """
+    Decode audio to its upload form, cached by content hash (the path or file
+    object is not part of the key)
+    
+    Caching the decoded source instead would keep several times as much PCM
+    alive per entry (44.1kHz stereo is over 5x the 16kHz mono form).
+    """
+    return _load_upload_audio(_source, file_format)
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _plan_chunks(file_hash: str, max_chunk_size_mb: int, overlap_seconds: int,
+                 force_time_based: bool, use_numpy_vad: bool, upload_bitrate_kbps: Optional[int],
+                 _audio_segment: AudioSegment, _planned: list) -> Tuple[List[dict], List[Tuple[str, str]]]:
+    """
+    Plan chunk boundaries, cached by content hash and chunking settings
+    
+    Returns the plan with its progress messages instead of showing them, since
+    page output from here would be replayed on every cache hit. Appends to
+    _planned when the plan is actually computed rather than served from cache.
+    """
+    processor = AudioProcessor(max_chunk_size_mb, overlap_seconds, force_time_based, use_numpy_vad,
+                               upload_bitrate_kbps)
+    log = []
+    chunk_plan = processor._plan_chunks(_audio_segment, log)
+    _planned.append(True)
+    return chunk_plan, log
+
+
+def _show_messages(messages: List[Tuple[str, str]]):
+    """Show (level, message) pairs collected while planning, e.g. ('info', '...')"""
+    for level, message in messages:
+        getattr(st, level)(message)
+
 
 class AudioProcessor:
     """Handles audio file processing, validation, and intelligent chunking"""
@@ -28,44 +295,204 @@ class AudioProcessor:
         'mpga': 'mp3'
     }
     
-    def __init__(self, max_chunk_size_mb: int = 24, overlap_seconds: int = 3, force_time_based: bool = False):
+    # Buffer size used when streaming uploads to disk
+    COPY_BUFFER_SIZE = 8 * 1024 * 1024
+    
+    # Largest upload accepted for processing
+    MAX_FILE_SIZE_MB = 500
+    
+    # Frame length for NumPy silence detection
+    VAD_FRAME_MS = 10
+    
+    # Headroom for container overhead and VBR overshoot in encoded uploads
+    UPLOAD_SIZE_MARGIN = 0.05
+    
+    def __init__(self, max_chunk_size_mb: int = 24, overlap_seconds: int = 3, force_time_based: bool = False,
+                 use_numpy_vad: bool = True, upload_bitrate_kbps: Optional[int] = None):
         self.max_chunk_size_mb = max_chunk_size_mb
         self.overlap_seconds = overlap_seconds
         self.max_chunk_size_bytes = max_chunk_size_mb * 1024 * 1024
         self.force_time_based = force_time_based
+        self.use_numpy_vad = use_numpy_vad
+        self.upload_bitrate_kbps = upload_bitrate_kbps
+        
+        # Upload size is linear in duration, so the longest chunk that fits is known up front
+        if upload_bitrate_kbps:
+            self.bytes_per_second = upload_bitrate_kbps * 1000 / 8
+        else:
+            self.bytes_per_second = WHISPER_FRAME_RATE * WHISPER_CHANNELS * WHISPER_SAMPLE_WIDTH
+        self.max_chunk_duration = min(
+            self.max_chunk_size_bytes * (1 - self.UPLOAD_SIZE_MARGIN) / self.bytes_per_second,
+            MAX_CHUNK_SECONDS
+        )
     
-    def validate_audio_file(self, uploaded_file) -> Tuple[bool, str, Optional[AudioSegment]]:
+    def validate_upload(self, uploaded_file) -> Tuple[bool, str]:
         """
-        Validate uploaded audio file
+        Check an upload's format and size before anything is copied or decoded
         
         Args:
             uploaded_file: Streamlit uploaded file object
             
         Returns:
-            Tuple of (is_valid, error_message, audio_segment)
+            Tuple of (is_valid, error_message)
+        """
+        file_extension = os.path.splitext(uploaded_file.name)[1].lstrip('.').lower()
+        if file_extension not in self.SUPPORTED_FORMATS:
+            return False, f"Unsupported file format: {file_extension}. Supported formats: {', '.join(self.SUPPORTED_FORMATS.keys())}"
+        
+        if uploaded_file.size > self.MAX_FILE_SIZE_MB * 1024 * 1024:
+            return False, f"File too large. Maximum size is {self.MAX_FILE_SIZE_MB}MB."
+        
+        return True, ""
+    
+    def probe_upload(self, uploaded_file) -> Tuple[bool, str, Optional[float]]:
+        """
+        Check that an upload sent without decoding (see fits_single_request) is
+        readable audio at least a second long
+        
+        Only the file's headers are read, so this costs far less than the
+        decode validate_audio_file does.
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object
+            
+        Returns:
+            Tuple of (is_valid, error_message, duration_seconds)
+        """
+        if uploaded_file.size == 0:
+            return False, "Audio file is empty.", None
+        
+        file_extension = os.path.splitext(uploaded_file.name)[1].lstrip('.').lower()
+        try:
+            duration_seconds = _probe_duration(uploaded_file, file_extension)
+        except Exception as e:
+            return False, f"Error loading audio file: {str(e)}", None
+        finally:
+            uploaded_file.seek(0)
+        
+        if duration_seconds < 1.0:
+            return False, "Audio file is too short (less than 1 second).", None
+        
+        return True, "", duration_seconds
+    
+    def needs_disk_copy(self, uploaded_file) -> bool:
+        """
+        Check if an upload has to be written to disk before it can be decoded
+        
+        Formats libsndfile reads are decoded straight from the upload's buffer;
+        the rest go through ffmpeg, which needs a seekable file (MP4/M4A keep
+        their index at the end).
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object
+            
+        Returns:
+            True if the upload should be saved with save_uploaded_file first
+        """
+        file_extension = os.path.splitext(uploaded_file.name)[1].lstrip('.').lower()
+        return sf is None or file_extension not in SOUNDFILE_FORMATS
+    
+    def save_uploaded_file(self, uploaded_file) -> str:
+        """
+        Stream uploaded file to a temporary file on disk
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object
+            
+        Returns:
+            Path to temporary file
+        """
+        suffix = os.path.splitext(uploaded_file.name)[1].lower()
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            if hasattr(uploaded_file, 'getbuffer'):
+                # Write straight from the upload's buffer; no intermediate bytes copies
+                with uploaded_file.getbuffer() as view:
+                    temp_file.write(view)
+            else:
+                uploaded_file.seek(0)
+                shutil.copyfileobj(uploaded_file, temp_file, length=self.COPY_BUFFER_SIZE)
+                uploaded_file.seek(0)
+        return temp_file.name
+    
+    def compute_file_hash(self, file_path: str) -> str:
+        """
+        Compute a content hash of a file (BLAKE3 if available, else SHA-256)
+        
+        Args:
+            file_path: Path to file
+            
+        Returns:
+            Hex digest of the file content
+        """
+        file_hash = _content_hasher()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(self.COPY_BUFFER_SIZE), b''):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+    
+    def compute_upload_hash(self, uploaded_file) -> str:
+        """
+        Compute a content hash of an uploaded file without copying it
+        
+        Hashes the upload's in-memory buffer through a memoryview, so neither a
+        bytes copy nor a disk read is needed. Matches compute_file_hash for the
+        same content.
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object
+            
+        Returns:
+            Hex digest of the file content
+        """
+        file_hash = _content_hasher()
+        with memoryview(uploaded_file.getbuffer()) as view:
+            for offset in range(0, len(view), self.COPY_BUFFER_SIZE):
+                file_hash.update(view[offset:offset + self.COPY_BUFFER_SIZE])
+        return file_hash.hexdigest()
+    
+    def validate_audio_file(self, file_path: Union[str, BinaryIO],
+                            file_hash: Optional[str] = None
+                            ) -> Tuple[bool, str, Optional[AudioSegment], Optional[Dict[str, Any]]]:
+        """
+        Validate audio file on disk or in memory
+        
+        Args:
+            file_path: Path to audio file (see save_uploaded_file), or the uploaded
+                file itself when it can be decoded in memory (see needs_disk_copy)
+            file_hash: Content hash of the file; when given, decoding is cached
+            
+        Returns:
+            Tuple of (is_valid, error_message, audio_segment, audio_info), where
+            audio_segment is already in the 16kHz mono upload form (see
+            downmix_for_upload) and audio_info describes the source as decoded
+            (see get_audio_info)
         """
         try:
             # Check file extension
-            file_extension = uploaded_file.name.split('.')[-1].lower()
+            file_name = file_path if isinstance(file_path, str) else file_path.name
+            file_extension = os.path.splitext(file_name)[1].lstrip('.').lower()
             if file_extension not in self.SUPPORTED_FORMATS:
-                return False, f"Unsupported file format: {file_extension}. Supported formats: {', '.join(self.SUPPORTED_FORMATS.keys())}", None
+                return False, f"Unsupported file format: {file_extension}. Supported formats: {', '.join(self.SUPPORTED_FORMATS.keys())}", None, None
             
             # Check file size (basic check)
-            if uploaded_file.size > 500 * 1024 * 1024:  # 500MB limit
-                return False, "File too large. Maximum size is 500MB.", None
+            file_size = os.path.getsize(file_path) if isinstance(file_path, str) else file_path.size
+            if file_size > self.MAX_FILE_SIZE_MB * 1024 * 1024:
+                return False, f"File too large. Maximum size is {self.MAX_FILE_SIZE_MB}MB.", None, None
             
-            # Load audio file
-            audio_data = uploaded_file.read()
-            audio_segment = AudioSegment.from_file(io.BytesIO(audio_data), format=file_extension)
+            # Decode straight from disk or from the upload's buffer
+            if file_hash:
+                audio_segment, source_format = _decode_audio(file_hash, file_extension, file_path)
+            else:
+                audio_segment, source_format = _load_upload_audio(file_path, file_extension)
             
             # Check if audio is too short
             if len(audio_segment) < 1000:  # Less than 1 second
-                return False, "Audio file is too short (less than 1 second).", None
+                return False, "Audio file is too short (less than 1 second).", None, None
             
-            return True, "", audio_segment
+            return True, "", audio_segment, {**self.get_audio_info(audio_segment), **source_format}
             
         except Exception as e:
-            return False, f"Error loading audio file: {str(e)}", None
+            return False, f"Error loading audio file: {str(e)}", None, None
     
     def get_audio_info(self, audio_segment: AudioSegment) -> dict:
         """
@@ -93,11 +520,25 @@ class AudioProcessor:
     
     def _format_duration(self, seconds: float) -> str:
         """Format duration in seconds to HH:MM:SS format"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
+        minutes, secs = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
     
+    def fits_single_request(self, uploaded_file) -> bool:
+        """
+        Check if an upload can be sent to Whisper as-is, without decoding it
+        
+        Every supported format is accepted by the API directly, so an upload
+        within the chunk size limit needs no splitting or re-encoding.
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object
+            
+        Returns:
+            True if the upload fits in one request
+        """
+        return uploaded_file.size <= self.max_chunk_size_bytes * (1 - self.UPLOAD_SIZE_MARGIN)
+    
     def needs_chunking(self, audio_segment: AudioSegment) -> bool:
         """
         Check if audio file needs to be chunked
@@ -108,273 +549,433 @@ class AudioProcessor:
         Returns:
             True if chunking is needed
         """
-        # Estimate file size when exported as MP3
-        estimated_size = len(audio_segment.raw_data) / (1024 * 1024)
-        return estimated_size > self.max_chunk_size_mb
+        return audio_segment.duration_seconds > self.max_chunk_duration
     
-    def split_audio_intelligently(self, audio_segment: AudioSegment) -> List[Tuple[AudioSegment, dict]]:
+    def upload_size_bytes(self, audio_segment: AudioSegment) -> int:
+        """
+        Estimate upload size of audio once downmixed and encoded for Whisper
+        
+        Args:
+            audio_segment: AudioSegment object
+            
+        Returns:
+            Estimated size in bytes at the upload bitrate (16kHz mono PCM if none)
+        """
+        return int(audio_segment.duration_seconds * self.bytes_per_second)
+    
+    def split_audio_intelligently(self, audio_segment: AudioSegment) -> Iterator[Tuple[AudioSegment, dict]]:
         """
         Split audio file into chunks using intelligent segmentation with debugging
         
+        Chunks are sliced lazily, one at a time, so only the chunks currently
+        being consumed are held in memory alongside the source audio.
+        
         Args:
             audio_segment: AudioSegment object to split
             
         Returns:
-            List of tuples (audio_chunk, metadata)
+            Iterator of tuples (audio_chunk, metadata)
         """
-        import time
+        yield from self.iter_chunks(audio_segment, self.plan_chunks(audio_segment))
+    
+    def plan_chunks(self, audio_segment: AudioSegment) -> List[dict]:
+        """
+        Decide chunk boundaries without copying any audio
         
-        st.info("🔍 Analyzing audio file for chunking...")
+        Args:
+            audio_segment: AudioSegment object to split
+            
+        Returns:
+            List of chunk metadata dicts; slice_start_ms/slice_end_ms locate each
+            chunk in the source and pad_start_ms/pad_end_ms how much neighbouring audio
+            it overlaps
+        """
+        log = []
+        chunk_plan = self._plan_chunks(audio_segment, log)
+        _show_messages(log)
+        return chunk_plan
+    
+    def _plan_chunks(self, audio_segment: AudioSegment, log: List[Tuple[str, str]]) -> List[dict]:
+        """Plan chunks (see plan_chunks), appending (level, message) progress pairs to log"""
+        log.append(('info', "🔍 Analyzing audio file for chunking..."))
         
-        chunks = []
+        total_ms = len(audio_segment)
         
         if not self.needs_chunking(audio_segment):
             # File is small enough, return as single chunk
-            st.info("✅ File is small enough - no chunking needed")
-            metadata = {
-                'chunk_index': 0,
-                'start_time': 0,
-                'end_time': len(audio_segment) / 1000.0,
-                'duration': len(audio_segment) / 1000.0,
-                'is_single_chunk': True,
-                'split_method': 'single_chunk'
-            }
-            return [(audio_segment, metadata)]
-        
-        # Calculate target chunk duration based on file size
-        total_duration = len(audio_segment) / 1000.0
-        estimated_chunks = max(1, int(len(audio_segment.raw_data) / self.max_chunk_size_bytes) + 1)
-        target_chunk_duration = total_duration / estimated_chunks
-        
-        st.info(f"📊 Chunking analysis:")
-        st.info(f"   - Total duration: {total_duration:.1f} seconds")
-        st.info(f"   - Estimated chunks needed: {estimated_chunks}")
-        st.info(f"   - Target chunk duration: {target_chunk_duration:.1f} seconds")
-        st.info(f"   - Max chunk size: {self.max_chunk_size_mb}MB")
+            log.append(('info', "✅ File is small enough - no chunking needed"))
+            metadata = self._chunk_metadata(0, 0, total_ms, 'single_chunk')
+            metadata['is_single_chunk'] = True
+            return [metadata]
         
         # Decide whether to attempt silence-based splitting
-        should_try_silence = not self.force_time_based and total_duration < 600  # Only try silence detection for files < 10 minutes
+        total_duration = total_ms / 1000.0
+        should_try_silence = not self.force_time_based
+        
+        # Calculate target chunk duration from the upload bitrate. Snapping to
+        # silence can stretch a chunk to 1.5x the target and overlap pads both ends
+        longest_chunk_ratio = 1.5 if should_try_silence else 1.0
+        max_target_duration = max(1.0, (self.max_chunk_duration - 2 * self.overlap_seconds) / longest_chunk_ratio)
+        estimated_chunks = max(1, math.ceil(total_duration / max_target_duration))
+        target_chunk_duration = total_duration / estimated_chunks
+        
+        log.append(('info', f"📊 Chunking analysis:"))
+        log.append(('info', f"   - Total duration: {total_duration:.1f} seconds"))
+        log.append(('info', f"   - Estimated chunks needed: {estimated_chunks}"))
+        log.append(('info', f"   - Target chunk duration: {target_chunk_duration:.1f} seconds"))
+        log.append(('info', f"   - Max chunk size: {self.max_chunk_size_mb}MB, up to {self.max_chunk_duration:.0f} seconds per chunk"))
         
         if should_try_silence:
-            st.info("🔇 Attempting silence-based splitting...")
+            log.append(('info', "🔇 Attempting silence-based splitting..."))
             silence_start = time.time()
-            silence_chunks = self._split_on_silence(audio_segment, target_chunk_duration)
+            silence_chunks = self._split_on_silence(audio_segment, target_chunk_duration, log)
             silence_time = time.time() - silence_start
             
             if silence_chunks:
-                st.success(f"✅ Silence-based splitting successful: {len(silence_chunks)} chunks in {silence_time:.2f}s")
+                log.append(('success', f"✅ Silence-based splitting successful: {len(silence_chunks)} chunks in {silence_time:.2f}s"))
                 chunks = silence_chunks
             else:
-                st.warning(f"⚠️ Silence-based splitting failed, using time-based splitting")
+                log.append(('warning', f"⚠️ Silence-based splitting failed, using time-based splitting"))
                 # Fallback to time-based splitting
                 time_start = time.time()
-                chunks = self._split_by_time(audio_segment, target_chunk_duration)
+                chunks = self._split_by_time(0, total_ms, target_chunk_duration)
                 time_time = time.time() - time_start
-                st.info(f"✅ Time-based splitting completed: {len(chunks)} chunks in {time_time:.2f}s")
+                log.append(('info', f"✅ Time-based splitting completed: {len(chunks)} chunks in {time_time:.2f}s"))
         else:
-            if self.force_time_based:
-                st.info("⏭️ Force time-based splitting enabled - skipping silence detection")
-            else:
-                st.info(f"⏭️ Skipping silence detection for large file ({total_duration:.1f}s) - using time-based splitting")
-            # Use time-based splitting directly for large files
+            log.append(('info', "⏭️ Force time-based splitting enabled - skipping silence detection"))
             time_start = time.time()
-            chunks = self._split_by_time(audio_segment, target_chunk_duration)
+            chunks = self._split_by_time(0, total_ms, target_chunk_duration)
             time_time = time.time() - time_start
-            st.info(f"✅ Time-based splitting completed: {len(chunks)} chunks in {time_time:.2f}s")
+            log.append(('info', f"✅ Time-based splitting completed: {len(chunks)} chunks in {time_time:.2f}s"))
         
-        # Add overlap between chunks
-        st.info(f"🔗 Adding {self.overlap_seconds}s overlap between chunks...")
+        # Add overlap at cuts that could not be placed in silence
+        log.append(('info', f"🔗 Adding {self.overlap_seconds}s overlap at cuts outside silence..."))
         overlap_start = time.time()
         chunks_with_overlap = self._add_overlap_to_chunks(chunks)
         overlap_time = time.time() - overlap_start
         
-        st.success(f"✅ Overlap processing completed in {overlap_time:.2f}s")
-        st.info(f"📦 Final result: {len(chunks_with_overlap)} chunks ready for transcription")
+        log.append(('success', f"✅ Overlap processing completed in {overlap_time:.2f}s"))
+        log.append(('info', f"📦 Final result: {len(chunks_with_overlap)} chunks ready for transcription"))
         
         return chunks_with_overlap
     
-    def _split_on_silence(self, audio_segment: AudioSegment, target_duration: float) -> List[Tuple[AudioSegment, dict]]:
+    def plan_chunks_cached(self, audio_segment: AudioSegment, file_hash: str) -> List[dict]:
         """
-        Split audio on silence with target duration consideration and timeout
+        Plan chunk boundaries, reusing a previous plan for the same file and settings
+        
+        Args:
+            audio_segment: AudioSegment object to split
+            file_hash: Content hash of the source file
+            
+        Returns:
+            List of chunk metadata dicts (see plan_chunks)
+        """
+        planned = []
+        chunk_plan, log = _plan_chunks(file_hash, self.max_chunk_size_mb, self.overlap_seconds,
+                                       self.force_time_based, self.use_numpy_vad, self.upload_bitrate_kbps,
+                                       audio_segment, planned)
+        # A reused plan's messages and timings describe work that did not run now
+        if planned:
+            _show_messages(log)
+        else:
+            st.info(f"♻️ Reusing the chunk plan from an earlier run: {len(chunk_plan)} chunks")
+        return chunk_plan
+    
+    def downmix_for_upload(self, audio_segment: AudioSegment) -> AudioSegment:
+        """
+        Convert audio to the 16kHz mono 16-bit form chunks are uploaded in
+        
+        Apply this before planning: silence detection then scans a fraction of
+        the samples, and holding this instead of the decoded source typically
+        cuts memory by 5x or more. Chunk plans are in milliseconds, so a plan
+        made from either form slices both the same way. Audio returned by
+        validate_audio_file is already in this form.
         
         Args:
             audio_segment: AudioSegment object
-            target_duration: Target duration for each chunk in seconds
             
         Returns:
-            List of audio chunks with metadata
+            Downmixed AudioSegment (the same object if already in that form)
+        """
+        return _downmix(audio_segment)
+    
+    def iter_chunks(self, audio_segment: AudioSegment, chunk_plan: List[dict]) -> Iterator[Tuple[AudioSegment, dict]]:
+        """
+        Slice chunks out of the source audio one at a time
+        
+        Args:
+            audio_segment: Source AudioSegment object
+            chunk_plan: Chunk metadata from plan_chunks
+            
+        Returns:
+            Iterator of tuples (audio_chunk, metadata)
         """
-        import signal
-        import time
+        total_ms = len(audio_segment)
+        raw_data = memoryview(audio_segment.raw_data)
+        frame_width = audio_segment.frame_width
         
-        def timeout_handler(signum, frame):
-            raise TimeoutError("Silence detection timed out")
+        def byte_offset(ms: int) -> int:
+            return int(audio_segment.frame_count(ms=ms)) * frame_width
         
-        try:
-            # Set a timeout for silence detection (30 seconds max)
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(30)
+        for metadata in chunk_plan:
+            start_ms, end_ms = metadata['slice_start_ms'], metadata['slice_end_ms']
+            pad_start_ms, pad_end_ms = metadata['pad_start_ms'], metadata['pad_end_ms']
+            
+            # Overlap is the neighbouring audio itself, so every chunk is a view
+            # into the source buffer; no bytes are copied until the encoder reads them
+            slice_start_ms = max(0, start_ms - pad_start_ms)
+            slice_end_ms = min(total_ms, end_ms + pad_end_ms)
+            if slice_start_ms == 0 and slice_end_ms >= total_ms:
+                chunk = audio_segment
+            else:
+                chunk = audio_segment._spawn(raw_data[byte_offset(slice_start_ms):byte_offset(slice_end_ms)])
+            
+            yield chunk, dict(metadata)
+    
+    def _chunk_metadata(self, chunk_index: int, start_ms: int, end_ms: int, split_method: str) -> dict:
+        """Build metadata for a chunk covering [start_ms, end_ms) of the source"""
+        return {
+            'chunk_index': chunk_index,
+            'start_time': start_ms / 1000.0,
+            'end_time': end_ms / 1000.0,
+            'duration': (end_ms - start_ms) / 1000.0,
+            'split_method': split_method,
+            'slice_start_ms': start_ms,
+            'slice_end_ms': end_ms,
+            'pad_start_ms': 0,
+            'pad_end_ms': 0
+        }
+    
+    def _split_on_silence(self, audio_segment: AudioSegment, target_duration: float,
+                          log: List[Tuple[str, str]]) -> List[dict]:
+        """
+        Split audio on silence with target duration consideration
+        
+        Args:
+            audio_segment: AudioSegment object
+            target_duration: Target duration for each chunk in seconds
+            log: Progress messages are appended here as (level, message) pairs
             
-            st.info("🔇 Analyzing audio for silence patterns...")
+        Returns:
+            List of chunk metadata dicts
+        """
+        try:
+            log.append(('info', "🔇 Analyzing audio for silence patterns..."))
             
             # For large files, use a more aggressive approach
-            total_duration = len(audio_segment) / 1000.0
+            total_ms = len(audio_segment)
+            total_duration = total_ms / 1000.0
+            
+            # One pass over the PCM gives both the average loudness and the
+            # per-frame levels the NumPy detector needs
+            if self.use_numpy_vad:
+                frame_rms = self._frame_rms(audio_segment)
+                average_dbfs = self._rms_to_dbfs(np.sqrt(np.mean(np.square(frame_rms, dtype=np.float64))),
+                                                 audio_segment) if len(frame_rms) else -float('inf')
+            else:
+                average_dbfs = audio_segment.dBFS
+            
             if total_duration > 300:  # More than 5 minutes
-                st.info("📊 Large file detected - using optimized silence detection")
+                log.append(('info', "📊 Large file detected - using optimized silence detection"))
                 # Use higher threshold and longer minimum silence for large files
-                silence_thresh = audio_segment.dBFS - 20  # 20dB below average volume
+                silence_thresh = average_dbfs - 20  # 20dB below average volume
                 min_silence_len = 2000  # 2 seconds minimum silence
             else:
                 # Standard settings for smaller files
-                silence_thresh = audio_segment.dBFS - 16  # 16dB below average volume
+                silence_thresh = average_dbfs - 16  # 16dB below average volume
                 min_silence_len = 1000  # 1 second minimum silence
             
-            st.info(f"   - Silence threshold: {silence_thresh:.1f} dB")
-            st.info(f"   - Minimum silence length: {min_silence_len}ms")
-            
-            # Split on silence
-            chunks = split_on_silence(
-                audio_segment,
-                min_silence_len=min_silence_len,
-                silence_thresh=silence_thresh,
-                keep_silence=500  # Keep 0.5 seconds of silence
-            )
+            log.append(('info', f"   - Silence threshold: {silence_thresh:.1f} dB"))
+            log.append(('info', f"   - Minimum silence length: {min_silence_len}ms"))
             
-            signal.alarm(0)  # Cancel the alarm
+            # Find cut points inside silent stretches so the pieces cover the whole file
+            if self.use_numpy_vad:
+                boundaries = self._detect_silence_boundaries(frame_rms, audio_segment, min_silence_len, silence_thresh)
+            else:
+                silent_ranges = _detect_silence_ffmpeg(audio_segment, silence_thresh, min_silence_len)
+                boundaries = np.array([(start + end) // 2 for start, end in silent_ranges], dtype=np.int64)
+                boundaries = boundaries[(boundaries > 0) & (boundaries < total_ms)]
             
-            if not chunks:
-                st.warning("⚠️ No silence patterns found - will use time-based splitting")
+            if not len(boundaries):
+                log.append(('warning', "⚠️ No silence patterns found - will use time-based splitting"))
                 return []
             
-            st.info(f"✅ Found {len(chunks)} silence-based chunks")
-            
-            # If chunks are too large, split them further
-            final_chunks = []
-            chunk_index = 0
-            current_time = 0
-            
-            for chunk in chunks:
-                chunk_duration = len(chunk) / 1000.0
-                
-                if chunk_duration <= target_duration * 1.5:  # Within reasonable range
-                    metadata = {
-                        'chunk_index': chunk_index,
-                        'start_time': current_time,
-                        'end_time': current_time + chunk_duration,
-                        'duration': chunk_duration,
-                        'split_method': 'silence'
-                    }
-                    final_chunks.append((chunk, metadata))
-                    current_time += chunk_duration
-                    chunk_index += 1
-                else:
-                    # Split large chunk by time
-                    st.info(f"📦 Chunk {chunk_index + 1} too large ({chunk_duration:.1f}s) - splitting by time")
-                    time_chunks = self._split_by_time(chunk, target_duration)
-                    for time_chunk, time_metadata in time_chunks:
-                        time_metadata['chunk_index'] = chunk_index
-                        time_metadata['start_time'] = current_time
-                        time_metadata['end_time'] = current_time + time_metadata['duration']
-                        time_metadata['split_method'] = 'time_fallback'
-                        final_chunks.append((time_chunk, time_metadata))
-                        current_time += time_metadata['duration']
-                        chunk_index += 1
+            log.append(('info', f"✅ Found {len(boundaries)} silence boundaries"))
+            
+            # Snap every target cut position to its nearest silence boundary in one
+            # vectorized pass; targets with no silence nearby are cut at the target
+            cuts, snapped = self._snap_cuts_to_silence(boundaries, total_ms, target_duration)
+            edges = [0, *cuts.tolist(), total_ms]
+            methods = ['silence' if s else 'time_fallback' for s in snapped.tolist()]
+            methods.append(methods[-1] if methods else 'silence')
+            
+            final_chunks = [
+                self._chunk_metadata(i, start_ms, end_ms, method)
+                for i, (start_ms, end_ms, method) in enumerate(zip(edges[:-1], edges[1:], methods))
+            ]
+            
+            fallback_count = len(methods) - methods.count('silence')
+            if fallback_count:
+                log.append(('info', f"📦 {fallback_count} chunk(s) had no nearby silence - split by time"))
             
             return final_chunks
             
-        except TimeoutError:
-            signal.alarm(0)  # Cancel the alarm
-            st.warning("⏰ Silence detection timed out after 30 seconds - using time-based splitting")
+        except subprocess.TimeoutExpired:
+            log.append(('warning', f"⏰ Silence detection timed out after {SILENCE_DETECT_TIMEOUT_SECONDS} seconds - using time-based splitting"))
             return []
         except Exception as e:
-            signal.alarm(0)  # Cancel the alarm
-            st.warning(f"❌ Silence detection failed: {str(e)}. Using time-based splitting.")
+            log.append(('warning', f"❌ Silence detection failed: {str(e)}. Using time-based splitting."))
             return []
     
-    def _split_by_time(self, audio_segment: AudioSegment, target_duration: float) -> List[Tuple[AudioSegment, dict]]:
+    def _snap_cuts_to_silence(self, boundaries: np.ndarray, total_ms: int,
+                              target_duration: float) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Split audio by time intervals
+        Pick a cut position for every target chunk end
+        
+        Each multiple of the target duration is moved to the nearest silence
+        boundary if one lies within a quarter of the target, keeping chunks
+        under 1.5x the target length.
         
         Args:
-            audio_segment: AudioSegment object
+            boundaries: Sorted silence boundary positions in milliseconds
+            total_ms: Length of the audio in milliseconds
             target_duration: Target duration for each chunk in seconds
             
         Returns:
-            List of audio chunks with metadata
+            Tuple of (cut positions in ms, whether each cut landed on silence)
         """
-        chunks = []
-        total_duration = len(audio_segment) / 1000.0
-        chunk_index = 0
+        step_ms = target_duration * 1000
+        targets = np.arange(step_ms, total_ms - step_ms / 4, step_ms).astype(np.int64)
+        if not len(targets):
+            return targets, np.zeros(0, dtype=bool)
         
-        start_time = 0
-        while start_time < total_duration:
-            end_time = min(start_time + target_duration, total_duration)
-            
-            # Convert to milliseconds
-            start_ms = int(start_time * 1000)
-            end_ms = int(end_time * 1000)
+        right = np.searchsorted(boundaries, targets).clip(max=len(boundaries) - 1)
+        left = (right - 1).clip(min=0)
+        nearest = np.where(
+            np.abs(boundaries[left] - targets) <= np.abs(boundaries[right] - targets),
+            boundaries[left], boundaries[right]
+        )
+        
+        snapped = np.abs(nearest - targets) <= step_ms / 4
+        cuts = np.where(snapped, nearest, targets)
+        
+        # Drop cuts that collapsed onto the same position
+        cuts, keep = np.unique(cuts, return_index=True)
+        return cuts, snapped[keep]
+    
+    def _frame_rms(self, audio_segment: AudioSegment) -> np.ndarray:
+        """
+        Compute the RMS level of every VAD_FRAME_MS frame in one vectorized pass
+        
+        Args:
+            audio_segment: AudioSegment object
             
-            chunk = audio_segment[start_ms:end_ms]
-            duration = len(chunk) / 1000.0
+        Returns:
+            Array of per-frame RMS values in sample units
+        """
+        dtype = {1: np.int8, 2: np.int16, 4: np.int32}[audio_segment.sample_width]
+        samples = np.frombuffer(audio_segment.raw_data, dtype=dtype)
+        
+        # Interleaved samples per frame, so RMS covers all channels like pydub's rms
+        frame_size = int(audio_segment.frame_rate * self.VAD_FRAME_MS / 1000) * audio_segment.channels
+        n_frames = len(samples) // frame_size
+        if n_frames == 0:
+            return np.empty(0, dtype=np.float32)
+        
+        frames = samples[:n_frames * frame_size].reshape(n_frames, frame_size).astype(np.float32)
+        return np.sqrt(np.square(frames).mean(axis=1))
+    
+    def _rms_to_dbfs(self, rms: float, audio_segment: AudioSegment) -> float:
+        """Convert an RMS level to dBFS the way pydub's AudioSegment.dBFS does"""
+        if rms == 0:
+            return -float('inf')
+        return ratio_to_db(rms / audio_segment.max_possible_amplitude)
+    
+    def _detect_silence_boundaries(self, frame_rms: np.ndarray, audio_segment: AudioSegment,
+                                   min_silence_len: int, silence_thresh: float) -> np.ndarray:
+        """
+        Find split points in silent stretches from per-frame RMS levels
+        
+        Args:
+            frame_rms: Per-frame RMS levels from _frame_rms
+            audio_segment: AudioSegment the levels were computed from
+            min_silence_len: Minimum silence length in milliseconds
+            silence_thresh: Silence threshold in dBFS
             
-            metadata = {
-                'chunk_index': chunk_index,
-                'start_time': start_time,
-                'end_time': end_time,
-                'duration': duration,
-                'split_method': 'time'
-            }
+        Returns:
+            Array of split points in milliseconds, one in the middle of each silent stretch
+        """
+        if not len(frame_rms):
+            return np.empty(0, dtype=np.int64)
+        
+        silent = frame_rms <= db_to_float(silence_thresh) * audio_segment.max_possible_amplitude
+        
+        # +1 where a silent run starts, -1 where it ends
+        edges = np.diff(np.concatenate(([0], silent.view(np.int8), [0])))
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        long_runs = (run_ends - run_starts) * self.VAD_FRAME_MS >= min_silence_len
+        
+        midpoints = (run_starts[long_runs] + run_ends[long_runs]) // 2 * self.VAD_FRAME_MS
+        return midpoints[(midpoints > 0) & (midpoints < len(audio_segment))]
+    
+    def _split_by_time(self, start_ms: int, end_ms: int, target_duration: float) -> List[dict]:
+        """
+        Split a span of audio by time intervals
+        
+        Args:
+            start_ms: Start of the span in milliseconds
+            end_ms: End of the span in milliseconds
+            target_duration: Target duration for each chunk in seconds
             
-            chunks.append((chunk, metadata))
-            start_time = end_time
-            chunk_index += 1
+        Returns:
+            List of chunk metadata dicts
+        """
+        chunks = []
+        step_ms = max(1, int(target_duration * 1000))
+        
+        for chunk_start_ms in range(start_ms, end_ms, step_ms):
+            chunk_end_ms = min(chunk_start_ms + step_ms, end_ms)
+            chunks.append(self._chunk_metadata(len(chunks), chunk_start_ms, chunk_end_ms, 'time'))
         
         return chunks
     
-    def _add_overlap_to_chunks(self, chunks: List[Tuple[AudioSegment, dict]]) -> List[Tuple[AudioSegment, dict]]:
+    def _add_overlap_to_chunks(self, chunks: List[dict]) -> List[dict]:
         """
-        Add overlap between chunks to avoid word cutoffs
+        Extend chunks into their neighbours to avoid word cutoffs
+        
+        Cuts that land in silence split no words, so only the other cuts are
+        padded; no audio is sent to Whisper twice around a silence cut. A
+        chunk's split_method describes how its end was cut.
         
         Args:
-            chunks: List of audio chunks with metadata
+            chunks: List of chunk metadata dicts
             
         Returns:
-            List of chunks with overlap added
+            List of chunk metadata dicts with overlap padding added
         """
         if len(chunks) <= 1:
             return chunks
         
         overlap_ms = self.overlap_seconds * 1000
-        final_chunks = []
-        
-        for i, (chunk, metadata) in enumerate(chunks):
-            if i == 0:
-                # First chunk: add overlap at the end
-                if len(chunks) > 1:
-                    overlap_duration = min(overlap_ms, len(chunk) // 4)  # Max 25% of chunk
-                    extended_chunk = chunk + AudioSegment.silent(duration=overlap_duration)
-                    metadata['end_time'] += overlap_duration / 1000.0
-                    metadata['duration'] = len(extended_chunk) / 1000.0
-                    final_chunks.append((extended_chunk, metadata))
-                else:
-                    final_chunks.append((chunk, metadata))
-            elif i == len(chunks) - 1:
-                # Last chunk: add overlap at the beginning
-                overlap_duration = min(overlap_ms, len(chunk) // 4)
-                extended_chunk = AudioSegment.silent(duration=overlap_duration) + chunk
-                metadata['start_time'] -= overlap_duration / 1000.0
-                metadata['duration'] = len(extended_chunk) / 1000.0
-                final_chunks.append((extended_chunk, metadata))
-            else:
-                # Middle chunks: add overlap at both ends
-                overlap_duration = min(overlap_ms, len(chunk) // 4)
-                extended_chunk = AudioSegment.silent(duration=overlap_duration) + chunk + AudioSegment.silent(duration=overlap_duration)
-                metadata['start_time'] -= overlap_duration / 1000.0
-                metadata['end_time'] += overlap_duration / 1000.0
-                metadata['duration'] = len(extended_chunk) / 1000.0
-                final_chunks.append((extended_chunk, metadata))
         
-        return final_chunks
+        for i, metadata in enumerate(chunks):
+            chunk_ms = metadata['slice_end_ms'] - metadata['slice_start_ms']
+            overlap_duration = min(overlap_ms, chunk_ms // 4)  # Max 25% of chunk
+            
+            # First chunk: overlap at the end; last chunk: at the beginning; middle chunks: both.
+            # The overlap is taken from the neighbouring chunk, so it can't exceed its length
+            if i > 0 and chunks[i - 1]['split_method'] != 'silence':
+                previous = chunks[i - 1]
+                metadata['pad_start_ms'] = min(overlap_duration, previous['slice_end_ms'] - previous['slice_start_ms'])
+                metadata['start_time'] -= metadata['pad_start_ms'] / 1000.0
+            if i < len(chunks) - 1 and metadata['split_method'] != 'silence':
+                following = chunks[i + 1]
+                metadata['pad_end_ms'] = min(overlap_duration, following['slice_end_ms'] - following['slice_start_ms'])
+                metadata['end_time'] += metadata['pad_end_ms'] / 1000.0
+            metadata['duration'] = (metadata['pad_start_ms'] + chunk_ms + metadata['pad_end_ms']) / 1000.0
+        
+        return chunks
     
     def export_chunk_to_temp_file(self, chunk: AudioSegment, chunk_index: int) -> str:
         """
@@ -387,8 +988,8 @@ class AudioProcessor:
         Returns:
             Path to temporary file
         """
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-        chunk.export(temp_file.name, format='mp3', bitrate='128k')
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
+            temp_file.write(ffmpeg_encode(chunk, 'mp3', ['-c:a', 'libmp3lame', '-b:a', f'{MP3_BITRATE_KBPS}k']))
         return temp_file.name
     
     def cleanup_temp_files(self, file_paths: List[str]):
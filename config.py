@@ -49,6 +49,7 @@ class Config:
     # API Configuration
     MAX_RETRIES = 3
     RETRY_DELAY = 1  # seconds
+    MAX_CONCURRENT_REQUESTS = 8
     
     # UI Configuration
     PAGE_TITLE = "Audio Transcription App"
@@ -82,6 +83,7 @@ class Config:
             'LANGUAGE_OPTIONS': cls.LANGUAGE_OPTIONS,
             'MAX_RETRIES': cls.MAX_RETRIES,
             'RETRY_DELAY': cls.RETRY_DELAY,
+            'MAX_CONCURRENT_REQUESTS': cls.MAX_CONCURRENT_REQUESTS,
             'PAGE_TITLE': cls.PAGE_TITLE,
             'PAGE_ICON': cls.PAGE_ICON,
             'LAYOUT': cls.LAYOUT,
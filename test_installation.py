@@ -11,6 +11,7 @@ def test_imports():
     required_packages = [
         'streamlit',
         'openai', 
+        'httpx',
         'pydub',
         'dotenv'
     ]
@@ -6,8 +6,68 @@ Handles text processing, formatting, and export functionality
 import re
 import json
 import streamlit as st
-from typing import List, Dict, Any, Optional
-from datetime import timedelta
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:  # optional: C JSON encoder, several times faster than json
+    orjson = None
+
+# Characters not allowed in export filenames (spaces included)
+_FILENAME_SANITIZE_RE = re.compile(r'[^\w.\-]')
+
+# Punctuation stripped from words before comparing chunk overlaps
+_NON_WORD_RE = re.compile(r'\W+')
+
+# Fewest matching words treated as a repeated chunk overlap
+MIN_OVERLAP_WORDS = 2
+
+
+def _split_timestamp(seconds: float) -> Tuple[int, int, int, int]:
+    """Split seconds into whole (hours, minutes, seconds, milliseconds) using integer math"""
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return hours, minutes, secs, milliseconds
+
+
+def _coerce_items(items: Optional[List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Normalize segments/words to plain dicts once, where chunk results are merged
+    
+    WhisperClient already returns dicts; API (Pydantic) objects from other
+    callers are converted field by field.
+    """
+    return [item if isinstance(item, dict) else dict(item) for item in items or ()]
+
+
+def _shift_timings(items: List[Dict[str, Any]], offset: float) -> List[Dict[str, Any]]:
+    """Move start and end of segment/word dicts by offset seconds, in place"""
+    for item in items:
+        item['start'] = (item.get('start') or 0.0) + offset
+        item['end'] = (item.get('end') or 0.0) + offset
+    return items
+
+
+def _longest_overlap(head: List[str], tail: List[str]) -> int:
+    """
+    Length of the longest prefix of head that is also a suffix of tail
+    
+    Uses the KMP failure function over head + separator + tail, so it is
+    linear in the number of words.
+    """
+    sequence = [*head, None, *tail]  # None never equals a word, so matches can't cross it
+    failure = [0] * len(sequence)
+    for i in range(1, len(sequence)):
+        k = failure[i - 1]
+        while k and sequence[i] != sequence[k]:
+            k = failure[k - 1]
+        if sequence[i] == sequence[k]:
+            k += 1
+        failure[i] = k
+    return failure[-1]
 
 
 class TranscriptionProcessor:
@@ -20,6 +80,10 @@ class TranscriptionProcessor:
         """
         Combine multiple chunk transcriptions into a single result
         
+        Takes ownership of chunk_results: their segment and word dicts are
+        re-timed in place and reused in the combined result, so the same chunk
+        results must not be combined twice.
+        
         Args:
             chunk_results: List of transcription results from chunks
             
@@ -52,6 +116,9 @@ class TranscriptionProcessor:
                 'error': 'No successful transcriptions'
             }
         
+        # Chunks can complete in any order; sort once for all the merges below
+        successful_results.sort(key=lambda x: x.get('chunk_index', 0))
+        
         # Combine text
         combined_text = self._combine_text(successful_results)
         
@@ -72,6 +139,7 @@ class TranscriptionProcessor:
         
         return {
             'text': combined_text,
+            'word_count': len(combined_text.split()),
             'segments': combined_segments,
             'words': combined_words,
             'language': language,
@@ -82,26 +150,31 @@ class TranscriptionProcessor:
         }
     
     def _combine_text(self, results: List[Dict[str, Any]]) -> str:
-        """Combine text from multiple chunks, handling overlaps"""
+        """Combine text from multiple chunks (in chunk order), handling overlaps"""
         if not results:
             return ""
         
-        # Sort by chunk index
-        sorted_results = sorted(results, key=lambda x: x.get('chunk_index', 0))
-        
         combined_parts = []
-        for i, result in enumerate(sorted_results):
+        for i, result in enumerate(results):
             text = result.get('text', '').strip()
             if not text:
                 continue
             
-            # For first chunk, add all text
-            if i == 0:
+            # Only chunks extended into the previous one repeat its last words;
+            # cuts placed in silence have no overlap (pad_start_ms == 0), and
+            # there a word shared across the cut is genuinely spoken twice
+            overlaps_previous = (
+                combined_parts
+                and result.get('chunk_metadata', {}).get('pad_start_ms', 0) > 0
+                and results[i - 1].get('chunk_index') == result.get('chunk_index', 0) - 1
+                and results[i - 1].get('text', '').strip()
+            )
+            if overlaps_previous:
+                text = self._remove_text_overlap(combined_parts[-1], text)
+            # A chunk that only repeats the previous one's end adds nothing, and
+            # the next chunk is then compared with the last text that was kept
+            if text:
                 combined_parts.append(text)
-            else:
-                # For subsequent chunks, try to remove overlap
-                overlap_removed = self._remove_text_overlap(combined_parts[-1], text)
-                combined_parts.append(overlap_removed)
         
         return ' '.join(combined_parts)
     
@@ -110,90 +183,45 @@ class TranscriptionProcessor:
         if not previous_text or not current_text:
             return current_text
         
-        # Simple overlap detection based on word matching
-        prev_words = previous_text.split()
-        curr_words = current_text.split()
-        
-        # Find overlap by matching end of previous with start of current
-        max_overlap = min(len(prev_words), len(curr_words), 10)  # Max 10 words overlap
-        
-        for overlap_len in range(max_overlap, 0, -1):
-            if prev_words[-overlap_len:] == curr_words[:overlap_len]:
-                return ' '.join(curr_words[overlap_len:])
+        # Overlap detection based on word matching. Only the words that can
+        # overlap are split off; the rest of each chunk's text is left alone
+        max_words = 50  # Max 50 words overlap
+        prev_words = previous_text.rsplit(maxsplit=max_words)[-max_words:]
+        curr_words = current_text.split(maxsplit=max_words)
+        curr_rest = curr_words.pop() if len(curr_words) > max_words else ''
+        
+        # Find overlap by matching end of previous with start of current. Whisper
+        # often punctuates or capitalizes the same words differently on either
+        # side of a cut, so those are ignored
+        curr_tokens = [_NON_WORD_RE.sub('', word).lower() for word in curr_words]
+        overlap_len = _longest_overlap(
+            curr_tokens,
+            [_NON_WORD_RE.sub('', word).lower() for word in prev_words]
+        )
+        # A single matching word (or bare punctuation) is too weak to be sure it
+        # was transcribed twice rather than spoken twice
+        if sum(1 for token in curr_tokens[:overlap_len] if token) >= MIN_OVERLAP_WORDS:
+            return ' '.join(curr_words[overlap_len:] + ([curr_rest] if curr_rest else []))
         
         return current_text
     
     def _combine_segments(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Combine segments from multiple chunks with proper timing"""
+        """Combine segments from multiple chunks (in chunk order) with proper timing"""
         combined_segments = []
         
-        # Sort by chunk index
-        sorted_results = sorted(results, key=lambda x: x.get('chunk_index', 0))
-        
-        for result in sorted_results:
-            segments = result.get('segments', [])
-            chunk_metadata = result.get('chunk_metadata', {})
-            chunk_start_time = chunk_metadata.get('start_time', 0)
-            
-            for segment in segments:
-                # Handle both dictionary and Pydantic object formats
-                if hasattr(segment, 'start'):
-                    # Pydantic object - convert to dictionary
-                    adjusted_segment = {
-                        'start': getattr(segment, 'start', 0) + chunk_start_time,
-                        'end': getattr(segment, 'end', 0) + chunk_start_time,
-                        'text': getattr(segment, 'text', ''),
-                        'id': getattr(segment, 'id', None),
-                        'seek': getattr(segment, 'seek', None),
-                        'tokens': getattr(segment, 'tokens', []),
-                        'temperature': getattr(segment, 'temperature', None),
-                        'avg_logprob': getattr(segment, 'avg_logprob', None),
-                        'compression_ratio': getattr(segment, 'compression_ratio', None),
-                        'no_speech_prob': getattr(segment, 'no_speech_prob', None)
-                    }
-                else:
-                    # Dictionary
-                    adjusted_segment = segment.copy()
-                    if 'start' in segment:
-                        adjusted_segment['start'] += chunk_start_time
-                    if 'end' in segment:
-                        adjusted_segment['end'] += chunk_start_time
-                
-                combined_segments.append(adjusted_segment)
+        for result in results:
+            chunk_start_time = result.get('chunk_metadata', {}).get('start_time', 0)
+            combined_segments.extend(_shift_timings(_coerce_items(result.get('segments')), chunk_start_time))
         
         return combined_segments
     
     def _combine_words(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Combine words from multiple chunks with proper timing"""
+        """Combine words from multiple chunks (in chunk order) with proper timing"""
         combined_words = []
         
-        # Sort by chunk index
-        sorted_results = sorted(results, key=lambda x: x.get('chunk_index', 0))
-        
-        for result in sorted_results:
-            words = result.get('words', [])
-            chunk_metadata = result.get('chunk_metadata', {})
-            chunk_start_time = chunk_metadata.get('start_time', 0)
-            
-            for word in words:
-                # Handle both dictionary and Pydantic object formats
-                if hasattr(word, 'start'):
-                    # Pydantic object - convert to dictionary
-                    adjusted_word = {
-                        'start': getattr(word, 'start', 0) + chunk_start_time,
-                        'end': getattr(word, 'end', 0) + chunk_start_time,
-                        'word': getattr(word, 'word', ''),
-                        'probability': getattr(word, 'probability', None)
-                    }
-                else:
-                    # Dictionary
-                    adjusted_word = word.copy()
-                    if 'start' in word:
-                        adjusted_word['start'] += chunk_start_time
-                    if 'end' in word:
-                        adjusted_word['end'] += chunk_start_time
-                
-                combined_words.append(adjusted_word)
+        for result in results:
+            chunk_start_time = result.get('chunk_metadata', {}).get('start_time', 0)
+            combined_words.extend(_shift_timings(_coerce_items(result.get('words')), chunk_start_time))
         
         return combined_words
     
@@ -225,17 +253,9 @@ class TranscriptionProcessor:
         
         formatted_lines = []
         for segment in segments:
-            # Handle both dictionary and Pydantic object formats
-            if hasattr(segment, 'start'):
-                # Pydantic object
-                start_time = self._format_timestamp(getattr(segment, 'start', 0))
-                end_time = self._format_timestamp(getattr(segment, 'end', 0))
-                text = getattr(segment, 'text', '').strip()
-            else:
-                # Dictionary
-                start_time = self._format_timestamp(segment.get('start', 0))
-                end_time = self._format_timestamp(segment.get('end', 0))
-                text = segment.get('text', '').strip()
+            start_time = self._format_timestamp(segment.get('start', 0))
+            end_time = self._format_timestamp(segment.get('end', 0))
+            text = segment.get('text', '').strip()
             
             if text:
                 formatted_lines.append(f"[{start_time} - {end_time}] {text}")
@@ -244,10 +264,8 @@ class TranscriptionProcessor:
     
     def _format_timestamp(self, seconds: float) -> str:
         """Format seconds to HH:MM:SS.mmm format"""
-        td = timedelta(seconds=seconds)
-        hours, remainder = divmod(td.total_seconds(), 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return f"{int(hours):02d}:{int(minutes):02d}:{seconds:06.3f}"
+        hours, minutes, secs, milliseconds = _split_timestamp(seconds)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:03d}"
 
 
 class TranscriptionExporter:
@@ -288,23 +306,13 @@ class TranscriptionExporter:
         
         srt_lines = []
         for i, segment in enumerate(segments, 1):
-            # Handle both dictionary and Pydantic object formats
-            if hasattr(segment, 'start'):
-                # Pydantic object
-                start_time = self._format_srt_timestamp(getattr(segment, 'start', 0))
-                end_time = self._format_srt_timestamp(getattr(segment, 'end', 0))
-                text = getattr(segment, 'text', '').strip()
-            else:
-                # Dictionary
-                start_time = self._format_srt_timestamp(segment.get('start', 0))
-                end_time = self._format_srt_timestamp(segment.get('end', 0))
-                text = segment.get('text', '').strip()
+            start_time = self._format_srt_timestamp(segment.get('start', 0))
+            end_time = self._format_srt_timestamp(segment.get('end', 0))
+            text = segment.get('text', '').strip()
             
             if text:
-                srt_lines.append(f"{i}")
-                srt_lines.append(f"{start_time} --> {end_time}")
-                srt_lines.append(text)
-                srt_lines.append("")  # Empty line between subtitles
+                # One string per cue; the join adds the empty line between subtitles
+                srt_lines.append(f"{i}\n{start_time} --> {end_time}\n{text}\n")
         
         return '\n'.join(srt_lines)
     
@@ -322,25 +330,16 @@ class TranscriptionExporter:
         if not segments:
             return ""
         
-        vtt_lines = ["WEBVTT", ""]
+        vtt_lines = ["WEBVTT\n"]
         
         for segment in segments:
-            # Handle both dictionary and Pydantic object formats
-            if hasattr(segment, 'start'):
-                # Pydantic object
-                start_time = self._format_vtt_timestamp(getattr(segment, 'start', 0))
-                end_time = self._format_vtt_timestamp(getattr(segment, 'end', 0))
-                text = getattr(segment, 'text', '').strip()
-            else:
-                # Dictionary
-                start_time = self._format_vtt_timestamp(segment.get('start', 0))
-                end_time = self._format_vtt_timestamp(segment.get('end', 0))
-                text = segment.get('text', '').strip()
+            start_time = self._format_vtt_timestamp(segment.get('start', 0))
+            end_time = self._format_vtt_timestamp(segment.get('end', 0))
+            text = segment.get('text', '').strip()
             
             if text:
-                vtt_lines.append(f"{start_time} --> {end_time}")
-                vtt_lines.append(text)
-                vtt_lines.append("")  # Empty line between cues
+                # One string per cue; the join adds the empty line between cues
+                vtt_lines.append(f"{start_time} --> {end_time}\n{text}\n")
         
         return '\n'.join(vtt_lines)
     
@@ -367,27 +366,22 @@ class TranscriptionExporter:
             }
         }
         
+        if orjson is not None:
+            return orjson.dumps(export_data, option=orjson.OPT_INDENT_2).decode('utf-8')
         return json.dumps(export_data, indent=2, ensure_ascii=False)
     
     def _format_srt_timestamp(self, seconds: float) -> str:
         """Format timestamp for SRT format (HH:MM:SS,mmm)"""
-        td = timedelta(seconds=seconds)
-        hours, remainder = divmod(td.total_seconds(), 3600)
-        minutes, seconds = divmod(remainder, 60)
-        milliseconds = int((seconds % 1) * 1000)
-        return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d},{milliseconds:03d}"
+        hours, minutes, secs, milliseconds = _split_timestamp(seconds)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
     
     def _format_vtt_timestamp(self, seconds: float) -> str:
         """Format timestamp for VTT format (HH:MM:SS.mmm)"""
-        td = timedelta(seconds=seconds)
-        hours, remainder = divmod(td.total_seconds(), 3600)
-        minutes, seconds = divmod(remainder, 60)
-        milliseconds = int((seconds % 1) * 1000)
-        return f"{int(hours):02d}:{int(minutes):02d}:{seconds:06.3f}"
+        hours, minutes, secs, milliseconds = _split_timestamp(seconds)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:03d}"
     
     def _get_current_timestamp(self) -> str:
         """Get current timestamp in ISO format"""
-        from datetime import datetime
         return datetime.now().isoformat()
     
     def get_export_filename(self, base_name: str, format_type: str) -> str:
@@ -402,11 +396,9 @@ class TranscriptionExporter:
             Complete filename
         """
         # Clean base name
-        clean_name = re.sub(r'[^\w\-_\.]', '_', base_name)
-        clean_name = clean_name.replace(' ', '_')
+        clean_name = _FILENAME_SANITIZE_RE.sub('_', base_name)
         
         # Add timestamp
-        from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         return f"{clean_name}_{timestamp}.{format_type}"
@@ -3,127 +3,284 @@ OpenAI Whisper API Client for Streamlit Transcription App
 Handles API communication, retry logic, and error handling
 """
 
-import os
+import hashlib
+import io
+import random
 import time
+import threading
+import httpx
+import numpy as np
 import streamlit as st
-from typing import Optional, Dict, Any, List
-from openai import OpenAI
-import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import nullcontext
+from itertools import islice
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Tuple, Union, BinaryIO, Callable
+from openai import (
+    OpenAI, APITimeoutError, APIConnectionError, AuthenticationError, BadRequestError,
+    InternalServerError, PermissionDeniedError, RateLimitError
+)
+from pydub import AudioSegment
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from audio_processor import (
+    WHISPER_FRAME_RATE, WHISPER_CHANNELS, WHISPER_SAMPLE_WIDTH, OPUS_BITRATE_KBPS, MP3_BITRATE_KBPS,
+    ffmpeg_encode
+)
+
+try:
+    import h2  # enables HTTP/2 in httpx
+except ImportError:
+    h2 = None
+
+try:
+    import soundfile as sf
+except ImportError:  # optional: pydub/ffmpeg encodes chunks without it
+    sf = None
+
+# libsndfile >= 1.0.29 writes OGG/Opus in-process
+SOUNDFILE_OPUS = sf is not None and 'OPUS' in sf.available_subtypes('OGG')
+
+RESULT_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+RESULT_CACHE_MAX_ENTRIES = 512
+
+# How long an API key check is trusted before the key is tested again
+API_KEY_CHECK_TTL_SECONDS = 300
+
+# A stuck request is abandoned and retried after this long without a response.
+# Larger uploads take Whisper longer, so each MB uploaded adds to the budget
+REQUEST_READ_TIMEOUT_SECONDS = 60.0
+REQUEST_READ_TIMEOUT_PER_MB = 10.0
+
+
+@st.cache_resource(show_spinner=False)
+def get_openai_client(api_key: str) -> OpenAI:
+    """
+    Get a shared OpenAI client so its connection pool survives reruns
+    
+    Args:
+        api_key: OpenAI API key
+        
+    Returns:
+        OpenAI client, one per API key for the server process
+    """
+    # With HTTP/2, concurrent chunk uploads share one TLS connection
+    http_client = httpx.Client(
+        http2=h2 is not None,
+        timeout=httpx.Timeout(connect=5.0, read=REQUEST_READ_TIMEOUT_SECONDS, write=60.0, pool=5.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+    )
+    # WhisperClient retries with its own backoff, so SDK-level retries are disabled
+    return OpenAI(api_key=api_key, max_retries=0, http_client=http_client)
+
+
+# Fields kept from the API's segment and word objects; the rest (tokens,
+# log-probabilities, ...) are never displayed or exported
+SEGMENT_FIELDS = ('id', 'start', 'end', 'text')
+WORD_FIELDS = ('word', 'start', 'end')
+
+
+def _lean_items(items: Optional[Iterable[Any]], fields: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """Copy just the given fields of API segment/word objects into plain dicts"""
+    return [{field: getattr(item, field, None) for field in fields} for item in items or ()]
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Check if a failed request is worth retrying (throttling, network or server trouble)"""
+    if isinstance(error, RateLimitError):
+        # An exhausted quota is reported as a rate limit but won't clear up on retry
+        return getattr(error, 'code', None) != 'insufficient_quota'
+    return isinstance(error, (APIConnectionError, InternalServerError))
+
+
+def _describe_error(error: Exception) -> str:
+    """Name the kind of failure, to go in front of the API's own error message"""
+    if isinstance(error, RateLimitError):
+        if getattr(error, 'code', None) == 'insufficient_quota':
+            return "💳 API quota exceeded - check your OpenAI account"
+        return "🚫 Rate limit exceeded - API is being throttled"
+    if isinstance(error, AuthenticationError):
+        return "🔑 Invalid API key"
+    if isinstance(error, BadRequestError):
+        return "🔑 Invalid request parameters"
+    if isinstance(error, APITimeoutError):
+        return "⏰ Request timeout - network or server issue"
+    if isinstance(error, APIConnectionError):
+        return "🌐 Connection error - network issue"
+    return "❓ Unknown error"
+
+
+class _TranscriptionFailed(Exception):
+    """Carries a failed result out of the cache wrapper so it is not cached"""
+    
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__(result.get('error'))
+        self.result = result
+
+
+@st.cache_data(ttl=RESULT_CACHE_TTL_SECONDS, max_entries=RESULT_CACHE_MAX_ENTRIES, show_spinner=False)
+def _transcribe_cached(chunk_hash: str, model: str, language: Optional[str], prompt: Optional[str],
+                       api_key_hash: str, response_format: str, timestamp_granularities: Tuple[str, ...],
+                       _client: "WhisperClient", _get_audio: Callable[[], BinaryIO]) -> Dict[str, Any]:
+    """
+    Transcribe audio, cached per API key by content hash and request options
+    
+    The audio is only produced (encoded) on a cache miss.
+    """
+    audio_buffer = _get_audio()
+    result = _client.transcribe_audio_file(audio_buffer, language, prompt)
+    result['file_size_mb'] = audio_buffer.seek(0, io.SEEK_END) / (1024 * 1024)
+    if not result['success']:
+        raise _TranscriptionFailed(result)
+    return result
+
+
+@st.cache_data(ttl=API_KEY_CHECK_TTL_SECONDS, show_spinner=False)
+def _validate_api_key_cached(api_key_hash: str, _client: "WhisperClient") -> bool:
+    """Check an API key with a test request, cached per key hash"""
+    return _client._check_api_key()
 
 
 class WhisperClient:
     """Client for OpenAI Whisper API with retry logic and error handling"""
     
-    def __init__(self, api_key: str, model: str = "whisper-1"):
+    def __init__(self, api_key: str, model: str = "whisper-1", use_opus: bool = True,
+                 verbose: bool = False, max_concurrent_requests: int = 8,
+                 include_word_timestamps: bool = False, text_only: bool = False):
         """
         Initialize Whisper client
         
         Args:
             api_key: OpenAI API key
             model: Whisper model to use (default: whisper-1)
+            use_opus: Upload chunks as 24kbps OGG/Opus instead of 64kbps MP3
+            verbose: Show each chunk's attempt_log in transcribe_chunks_sequential
+            max_concurrent_requests: Upper bound on chunks transcribed at once
+            include_word_timestamps: Also request word-level timings (much larger responses)
+            text_only: Request plain text with no timestamps at all (smallest responses)
         """
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_openai_client(api_key)
+        # Results are cached per key; only a digest of it goes into cache keys
+        self.api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
         self.model = model
+        self.use_opus = use_opus
+        # Part of the result cache key, since the upload codec can change the transcript
+        self.upload_codec = f"opus-{OPUS_BITRATE_KBPS}k" if use_opus else f"mp3-{MP3_BITRATE_KBPS}k"
+        self.verbose = verbose
         self.max_retries = 3
         self.retry_delay = 1  # seconds
+        self.max_concurrent_requests = max_concurrent_requests
+        self.response_format = 'text' if text_only else 'verbose_json'
+        if text_only:
+            self.timestamp_granularities = ()
+        elif include_word_timestamps:
+            self.timestamp_granularities = ('word', 'segment')
+        else:
+            self.timestamp_granularities = ('segment',)
     
-    def transcribe_audio_file(self, file_path: str, language: Optional[str] = None, 
+    def transcribe_audio_file(self, file_path: Union[str, BinaryIO], language: Optional[str] = None, 
                             prompt: Optional[str] = None) -> Dict[str, Any]:
         """
-        Transcribe audio file using OpenAI Whisper API with detailed debugging
+        Transcribe audio file using OpenAI Whisper API, retrying transient failures
         
         Args:
-            file_path: Path to audio file
+            file_path: Path to audio file, or a named file-like object (e.g. BytesIO with .name)
             language: Language code (optional, auto-detect if None)
             prompt: Optional prompt to guide transcription
             
         Returns:
-            Dictionary with transcription results
+            Dictionary with transcription results. Its attempt_log lists what each
+            attempt did; nothing is written to the page, since this runs on worker
+            threads and inside the cached _transcribe_cached (whose page output
+            would be replayed on every cache hit)
         """
-        import time
-        
+        attempt_log = []
         for attempt in range(self.max_retries):
+            attempt_start = time.time()
             try:
-                st.info(f"🔄 API attempt {attempt + 1} of {self.max_retries}")
+                attempt_log.append(f"🔄 API attempt {attempt + 1} of {self.max_retries}")
                 
-                with open(file_path, 'rb') as audio_file:
+                with open(file_path, 'rb') if isinstance(file_path, str) else nullcontext(file_path) as audio_file:
+                    upload_mb = audio_file.seek(0, io.SEEK_END) / (1024 * 1024)
+                    audio_file.seek(0)
+                    
                     # Prepare transcription parameters
                     transcription_params = {
                         'model': self.model,
                         'file': audio_file,
-                        'response_format': 'verbose_json',
-                        'timestamp_granularities': ['word', 'segment']
+                        'response_format': self.response_format,
+                        'timeout': httpx.Timeout(
+                            connect=5.0,
+                            read=REQUEST_READ_TIMEOUT_SECONDS + REQUEST_READ_TIMEOUT_PER_MB * upload_mb,
+                            write=60.0,
+                            pool=5.0
+                        )
                     }
                     
                     # Add optional parameters
+                    if self.timestamp_granularities:
+                        transcription_params['timestamp_granularities'] = list(self.timestamp_granularities)
+                    
                     if language:
                         transcription_params['language'] = language
-                        st.info(f"🌍 Using specified language: {language}")
-                    else:
-                        st.info("🌍 Using auto-detect for language")
-                    
                     if prompt:
                         transcription_params['prompt'] = prompt
-                        st.info(f"💭 Using prompt: {prompt[:50]}...")
                     
-                    st.info(f"📤 Sending request to OpenAI API...")
-                    st.info(f"   - Model: {self.model}")
-                    st.info(f"   - Response format: verbose_json")
-                    st.info(f"   - Timestamp granularities: word, segment")
+                    attempt_log.append(f"📤 Sending {upload_mb:.2f}MB to {self.model} "
+                                       f"({self.response_format}, language: {language or 'auto-detect'})")
                     
                     # Make API call with timing
                     api_call_start = time.time()
                     response = self.client.audio.transcriptions.create(**transcription_params)
                     api_call_time = time.time() - api_call_start
                     
-                    st.success(f"✅ API call successful in {api_call_time:.2f} seconds")
+                    attempt_log.append(f"✅ API call successful in {api_call_time:.2f} seconds")
                     
-                    # Extract response data
-                    result = {
-                        'success': True,
-                        'text': response.text,
-                        'language': getattr(response, 'language', language),
-                        'duration': getattr(response, 'duration', None),
-                        'segments': getattr(response, 'segments', []),
-                        'words': getattr(response, 'words', []),
-                        'error': None,
-                        'api_call_time': api_call_time,
-                        'attempt': attempt + 1
-                    }
+                    # Extract response data; the text format returns a bare string
+                    if self.response_format == 'text':
+                        result = {
+                            'success': True,
+                            'text': response,
+                            'language': language,
+                            'duration': None,
+                            'segments': [],
+                            'words': [],
+                            'error': None,
+                            'api_call_time': api_call_time,
+                            'attempt': attempt + 1,
+                            'attempt_log': attempt_log
+                        }
+                    else:
+                        result = {
+                            'success': True,
+                            'text': response.text,
+                            'language': getattr(response, 'language', language),
+                            'duration': getattr(response, 'duration', None),
+                            'segments': _lean_items(getattr(response, 'segments', None), SEGMENT_FIELDS),
+                            'words': _lean_items(getattr(response, 'words', None), WORD_FIELDS),
+                            'error': None,
+                            'api_call_time': api_call_time,
+                            'attempt': attempt + 1,
+                            'attempt_log': attempt_log
+                        }
                     
-                    # Show response details
-                    st.info(f"📝 Response details:")
-                    st.info(f"   - Text length: {len(result['text'])} characters")
-                    st.info(f"   - Segments: {len(result['segments'])}")
-                    st.info(f"   - Words: {len(result['words'])}")
-                    if result['language']:
-                        st.info(f"   - Detected language: {result['language']}")
-                    if result['duration']:
-                        st.info(f"   - Duration: {result['duration']:.2f}s")
+                    attempt_log.append(f"📝 {len(result['text'])} characters, {len(result['segments'])} segments, "
+                                       f"{len(result['words'])} words")
                     
                     return result
                     
             except Exception as e:
                 error_msg = str(e)
-                st.warning(f"❌ Transcription attempt {attempt + 1} failed: {error_msg}")
-                
-                # Show detailed error information
-                if "rate_limit" in error_msg.lower():
-                    st.error("🚫 Rate limit exceeded - API is being throttled")
-                elif "quota" in error_msg.lower():
-                    st.error("💳 API quota exceeded - check your OpenAI account")
-                elif "invalid" in error_msg.lower():
-                    st.error("🔑 Invalid API key or request parameters")
-                elif "timeout" in error_msg.lower():
-                    st.error("⏰ Request timeout - network or server issue")
-                else:
-                    st.error(f"❓ Unknown error: {error_msg}")
+                attempt_time = time.time() - attempt_start
+                attempt_log.append(f"❌ Attempt {attempt + 1} failed after {attempt_time:.1f}s: {error_msg}")
                 
-                if attempt < self.max_retries - 1:
-                    wait_time = self.retry_delay * (2 ** attempt)
-                    st.info(f"⏳ Waiting {wait_time} seconds before retry...")
+                # Bad keys, bad requests and exhausted quota fail the same way every time
+                if _is_retryable(e) and attempt < self.max_retries - 1:
+                    # Jitter keeps concurrent chunks from retrying in lockstep
+                    wait_time = self.retry_delay * (2 ** attempt) + random.uniform(0, 0.5)
+                    attempt_log.append(f"⏳ Waiting {wait_time:.1f} seconds before retry...")
                     time.sleep(wait_time)
                 else:
+                    # Reported once per chunk by the caller, from the returned error
+                    error_msg = f"{_describe_error(e)}: {error_msg}"
                     return {
                         'success': False,
                         'text': '',
@@ -132,7 +289,8 @@ class WhisperClient:
                         'segments': [],
                         'words': [],
                         'error': error_msg,
-                        'attempt': attempt + 1
+                        'attempt': attempt + 1,
+                        'attempt_log': attempt_log
                     }
         
         return {
@@ -142,14 +300,15 @@ class WhisperClient:
             'duration': None,
             'segments': [],
             'words': [],
-            'error': 'Max retries exceeded'
+            'error': 'Max retries exceeded',
+            'attempt_log': attempt_log
         }
     
     def transcribe_chunk(self, chunk_data: tuple, chunk_index: int, 
                         total_chunks: int, language: Optional[str] = None,
                         prompt: Optional[str] = None) -> Dict[str, Any]:
         """
-        Transcribe a single audio chunk with detailed debugging
+        Transcribe a single audio chunk; per-attempt details are in result['attempt_log']
         
         Args:
             chunk_data: Tuple of (audio_segment, metadata)
@@ -161,71 +320,123 @@ class WhisperClient:
         Returns:
             Dictionary with transcription results
         """
-        import time
-        
         audio_chunk, metadata = chunk_data
         
-        st.info(f"🔧 Preparing chunk {chunk_index + 1} for transcription...")
+        # Whisper works on 16kHz mono, so anything above that is wasted upload
+        # bandwidth (no-op for chunks sliced from AudioProcessor.downmix_for_upload output)
+        audio_chunk = (audio_chunk.set_frame_rate(WHISPER_FRAME_RATE)
+                       .set_channels(WHISPER_CHANNELS)
+                       .set_sample_width(WHISPER_SAMPLE_WIDTH))
         
-        # Create temporary file for the chunk
-        temp_file_start = time.time()
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+        # Transcribe the chunk; identical audio is served from the result cache
+        # so a retry only pays for chunks that failed before. The key hashes the
+        # PCM rather than the encoded file: Ogg streams get a random serial
+        # number on every encode, so the same audio never encodes to the same
+        # bytes. On a hit the chunk is not encoded at all
+        api_start = time.time()
+        pcm_hash = hashlib.blake2b(audio_chunk.raw_data)
+        pcm_hash.update(self.upload_codec.encode())
+        chunk_hash = pcm_hash.hexdigest()
+        try:
+            result = _transcribe_cached(chunk_hash, self.model, language, prompt, self.api_key_hash,
+                                        self.response_format, self.timestamp_granularities,
+                                        self, lambda: self._encode_chunk(audio_chunk, chunk_index))
+        except _TranscriptionFailed as e:
+            result = e.result
+        api_time = time.time() - api_start
         
-        st.info(f"📁 Exporting audio chunk to temporary file...")
-        audio_chunk.export(temp_file.name, format='mp3', bitrate='128k')
+        # Add chunk metadata to result; file_size_mb comes from the (possibly cached) upload
+        result['chunk_metadata'] = metadata
+        result['chunk_index'] = chunk_index
+        result['api_time'] = api_time
         
-        temp_file_time = time.time() - temp_file_start
-        file_size = os.path.getsize(temp_file.name) / (1024 * 1024)  # MB
-        st.info(f"✅ Temporary file created: {file_size:.2f}MB in {temp_file_time:.2f}s")
+        return result
+    
+    def _encode_chunk(self, audio_chunk: AudioSegment, chunk_index: int) -> io.BytesIO:
+        """
+        Encode a 16kHz mono chunk in memory for upload; no temporary file needed
         
-        try:
-            # Update progress
-            progress = (chunk_index + 1) / total_chunks
-            st.progress(progress, text=f"Transcribing chunk {chunk_index + 1} of {total_chunks}")
-            
-            # Show API call details
-            st.info(f"🌐 Making API call to OpenAI Whisper...")
-            st.info(f"   - Model: {self.model}")
-            st.info(f"   - Language: {language or 'auto-detect'}")
-            st.info(f"   - File size: {file_size:.2f}MB")
-            
-            # Transcribe the chunk
-            api_start = time.time()
-            result = self.transcribe_audio_file(temp_file.name, language, prompt)
-            api_time = time.time() - api_start
-            
-            st.info(f"⏱️ API call completed in {api_time:.2f} seconds")
-            
-            # Show API response details
-            if result['success']:
-                st.success(f"✅ API response received: {len(result['text'])} characters")
-                if result.get('language'):
-                    st.info(f"🌍 Detected language: {result['language']}")
-                if result.get('duration'):
-                    st.info(f"⏱️ Audio duration: {result['duration']:.2f}s")
-            else:
-                st.error(f"❌ API call failed: {result.get('error', 'Unknown error')}")
-            
-            # Add chunk metadata to result
-            result['chunk_metadata'] = metadata
-            result['chunk_index'] = chunk_index
-            result['api_time'] = api_time
-            result['file_size_mb'] = file_size
+        Args:
+            audio_chunk: AudioSegment already converted to Whisper's sample format
+            chunk_index: Index of the chunk, used to name the upload
             
-            return result
+        Returns:
+            Named BytesIO holding the encoded chunk
+        """
+        audio_buffer = io.BytesIO()
+        
+        if self.use_opus and SOUNDFILE_OPUS:
+            # Encode straight from a view of the chunk's 16-bit samples without
+            # starting an ffmpeg process for every chunk
+            samples = np.frombuffer(audio_chunk.raw_data, dtype=np.int16)
+            sf.write(audio_buffer, samples, WHISPER_FRAME_RATE, format='OGG', subtype='OPUS')
+            audio_buffer.name = f"chunk_{chunk_index}.ogg"
+        elif self.use_opus:
+            # The voip profile tunes the encoder for speech intelligibility
+            audio_buffer.write(ffmpeg_encode(audio_chunk, 'ogg', [
+                '-c:a', 'libopus', '-b:a', f'{OPUS_BITRATE_KBPS}k', '-application', 'voip'
+            ]))
+            audio_buffer.name = f"chunk_{chunk_index}.ogg"
+        else:
+            audio_buffer.write(ffmpeg_encode(audio_chunk, 'mp3', ['-c:a', 'libmp3lame', '-b:a', f'{MP3_BITRATE_KBPS}k']))
+            audio_buffer.name = f"chunk_{chunk_index}.mp3"
+        
+        return audio_buffer
+    
+    def transcribe_upload(self, uploaded_file: BinaryIO, file_hash: str, language: Optional[str] = None,
+                          prompt: Optional[str] = None, duration: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Transcribe an upload in a single request, sending its original bytes
+        
+        For uploads small enough to skip decoding and chunking (see
+        AudioProcessor.fits_single_request). The result is shaped like a
+        transcribe_chunk result for a single chunk covering the whole file, so
+        it can be passed to combine_transcriptions unchanged.
+        
+        Args:
+            uploaded_file: Named file-like object holding the encoded audio
+            file_hash: Content hash of the upload, used as the result cache key
+            language: Language code (optional)
+            prompt: Optional prompt to guide transcription
+            duration: Length of the audio in seconds (see AudioProcessor.probe_upload),
+                used when the response carries none (text_only)
             
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file.name)
-                st.info(f"🗑️ Temporary file cleaned up")
-            except Exception as e:
-                st.warning(f"Could not delete temporary file: {str(e)}")
+        Returns:
+            Dictionary with transcription results
+        """
+        file_size = uploaded_file.size / (1024 * 1024) if hasattr(uploaded_file, 'size') else 0.0
+        
+        api_start = time.time()
+        try:
+            result = _transcribe_cached(file_hash, self.model, language, prompt, self.api_key_hash,
+                                        self.response_format, self.timestamp_granularities,
+                                        self, lambda: uploaded_file)
+        except _TranscriptionFailed as e:
+            result = e.result
+        api_time = time.time() - api_start
+        
+        duration = result.get('duration') or duration or 0.0
+        result['chunk_metadata'] = {
+            'chunk_index': 0,
+            'start_time': 0.0,
+            'end_time': duration,
+            'duration': duration,
+            'split_method': 'single_request',
+            'is_single_chunk': True
+        }
+        result['chunk_index'] = 0
+        result['api_time'] = api_time
+        result['file_size_mb'] = file_size
+        
+        return result
     
     def transcribe_chunks_sequential(self, chunks: List[tuple], language: Optional[str] = None,
                                    prompt: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Transcribe multiple chunks sequentially
+        Transcribe multiple chunks and return the results in chunk order
+        
+        The requests run concurrently (see transcribe_chunks_concurrent); only
+        the returned list is ordered.
         
         Args:
             chunks: List of (audio_segment, metadata) tuples
@@ -235,50 +446,94 @@ class WhisperClient:
         Returns:
             List of transcription results
         """
-        results = []
         total_chunks = len(chunks)
+        results = [None] * total_chunks
         
         st.info(f"Starting transcription of {total_chunks} chunks...")
         
-        for i, chunk_data in enumerate(chunks):
-            result = self.transcribe_chunk(chunk_data, i, total_chunks, language, prompt)
-            results.append(result)
-            
-            # Show intermediate progress
+        # Progress is reported here, on the calling thread, as chunks complete
+        for result in self.transcribe_chunks_concurrent(chunks, language, prompt, total_chunks):
+            i = result['chunk_index']
+            results[i] = result
             if result['success']:
                 st.success(f"✅ Chunk {i + 1} transcribed successfully")
             else:
                 st.error(f"❌ Chunk {i + 1} failed: {result['error']}")
+            if self.verbose:
+                st.caption("  \n".join(result.get('attempt_log', [])))
         
         return results
     
+    def transcribe_chunks_concurrent(self, chunks: Iterable[tuple], language: Optional[str] = None,
+                                   prompt: Optional[str] = None,
+                                   total_chunks: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe multiple chunks concurrently
+        
+        Chunks are dispatched to a thread pool of at most max_concurrent_requests
+        workers. Only that many chunks are pulled from ``chunks`` at a time, so a
+        lazy iterator keeps just the in-flight chunks in memory. Results are
+        yielded as they complete, so they are not in chunk order; use
+        result['chunk_index'] to place them.
+        
+        Args:
+            chunks: Iterable of (audio_segment, metadata) tuples
+            language: Language code (optional)
+            prompt: Optional prompt to guide transcription
+            total_chunks: Number of chunks, required when chunks has no len()
+            
+        Returns:
+            Iterator over transcription results in completion order
+        """
+        if total_chunks is None:
+            total_chunks = len(chunks)
+        if total_chunks == 0:
+            return
+        
+        # Workers write nothing to the page, but the result cache they go through
+        # expects the script run that started them (None from a background job)
+        ctx = get_script_run_ctx(suppress_warning=True)
+        
+        def attach_script_run_ctx():
+            add_script_run_ctx(threading.current_thread(), ctx)
+        
+        max_workers = min(self.max_concurrent_requests, total_chunks)
+        pending_chunks = enumerate(chunks)
+        
+        with ThreadPoolExecutor(max_workers=max_workers, initializer=attach_script_run_ctx) as executor:
+            in_flight = {
+                executor.submit(self.transcribe_chunk, chunk_data, i, total_chunks, language, prompt)
+                for i, chunk_data in islice(pending_chunks, max_workers)
+            }
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                # Refill the pool before yielding so uploads keep going while the caller renders
+                for i, chunk_data in islice(pending_chunks, len(done)):
+                    in_flight.add(executor.submit(self.transcribe_chunk, chunk_data, i, total_chunks, language, prompt))
+                for future in done:
+                    yield future.result()
+    
     def validate_api_key(self) -> bool:
         """
         Validate OpenAI API key by making a test request
         
+        The outcome is cached per key for API_KEY_CHECK_TTL_SECONDS, so repeated
+        checks don't each send a request.
+        
         Returns:
             True if API key is valid, False otherwise
         """
+        return _validate_api_key_cached(self.api_key_hash, self)
+    
+    def _check_api_key(self) -> bool:
+        """Send the test request behind validate_api_key"""
         try:
-            # Create a short silent audio file for testing
-            from pydub import AudioSegment
-            test_audio = AudioSegment.silent(duration=1000)  # 1 second of silence
-            
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-            test_audio.export(temp_file.name, format='mp3')
-            
-            try:
-                # Try to transcribe the silent audio
-                result = self.transcribe_audio_file(temp_file.name)
-                return result['success'] or 'quota' not in result.get('error', '').lower()
-            finally:
-                os.unlink(temp_file.name)
-                
-        except Exception as e:
-            error_msg = str(e).lower()
-            # Check for common API key errors
-            if any(keyword in error_msg for keyword in ['invalid', 'unauthorized', 'forbidden']):
-                return False
+            # Looking up the model is a small authenticated GET; nothing is transcribed or billed
+            self.client.models.retrieve(self.model, timeout=10.0)
+            return True
+        except (AuthenticationError, PermissionDeniedError):
+            return False
+        except Exception:
             # Other errors might be network-related, so we'll assume the key is valid
             return True
     